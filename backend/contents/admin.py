@@ -11,19 +11,20 @@ class ScientificFieldAdmin(admin.ModelAdmin):
 
 @admin.register(Content)
 class ContentAdmin(admin.ModelAdmin):
-    list_display = ('title', 'content_type', 'author', 'status', 'views_count', 'created_at')
+    list_display = ('title', 'content_type', 'author', 'status', 'views_count', 'likes_count', 'created_at')
     list_filter = ('content_type', 'status', 'scientific_fields', 'is_public', 'created_at')
     search_fields = ('title', 'description', 'keywords')
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ('views_count', 'created_at', 'updated_at')
+    readonly_fields = ('views_count', 'likes_count', 'comments_count', 'created_at', 'updated_at')
     filter_horizontal = ('scientific_fields',)
 
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ('author', 'content', 'parent', 'created_at')
+    list_display = ('author', 'content', 'parent', 'replies_count', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('text', 'author__email')
+    readonly_fields = ('replies_count',)
 
 
 @admin.register(Like)
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ContentsConfig(AppConfig):
+    name = 'contents'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Системна перевірка кешу для реплік БД
+        from scientific_discoveries import db_router  # noqa: F401
@@ -0,0 +1,109 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class ResponseCache:
+    """
+    Кеш відповідей публічних списків/деталей контенту.
+
+    Ключ містить поточну версію даних: будь-яка зміна контенту, лайків
+    чи коментарів збільшує версію (див. signals.py), і старі записи
+    просто перестають читатися, доживаючи до свого TTL.
+    Бекенд - будь-який кеш Django (налаштування CACHES).
+    """
+    prefix = 'contents:responses'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+    @property
+    def version_key(self):
+        return f'{self.prefix}:version'
+
+    def version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            # Початкова версія унікальна, тож якщо ключ версії витіснили з кешу,
+            # старі записи все одно не повернуться
+            self.cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    async def aversion(self):
+        version = await self.cache.aget(self.version_key)
+        if version is None:
+            await self.cache.aadd(self.version_key, time.time_ns(), timeout=None)
+            version = await self.cache.aget(self.version_key)
+        return version
+
+    def bump(self):
+        """Інвалідує всі закешовані відповіді"""
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.set(self.version_key, time.time_ns(), timeout=None)
+
+    def make_key(self, action, request, **kwargs):
+        """Ключ за дією, параметрами URL та нормалізованими query-параметрами"""
+        return self.versioned_key(self.version(), action, request, **kwargs)
+
+    async def amake_key(self, action, request, **kwargs):
+        return self.versioned_key(await self.aversion(), action, request, **kwargs)
+
+    def versioned_key(self, version, action, request, **kwargs):
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        )
+        raw = repr((action, sorted(kwargs.items()), params))
+        digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+        return f'{self.prefix}:{version}:{digest}'
+
+    def get(self, key):
+        return self._count(self.cache.get(key))
+
+    async def aget(self, key):
+        return self._count(await self.cache.aget(key))
+
+    def _count(self, data):
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, key, data):
+        self.cache.set(key, data, timeout=self.timeout)
+
+    async def aset(self, key, data):
+        await self.cache.aset(key, data, timeout=self.timeout)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0,
+            'version': self.version(),
+        }
+
+
+response_cache = ResponseCache()
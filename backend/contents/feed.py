@@ -0,0 +1,108 @@
+"""
+Стрічка контенту від користувачів, на яких підписаний читач.
+
+Гібридна схема:
+- автори з кількістю підписників до FEED_FANOUT_MAX_FOLLOWERS - fan-out on write:
+  новий контент одразу записується в таблицю FeedEntry кожного підписника;
+- популярні автори в таблицю не пишуться (це були б тисячі вставок на публікацію),
+  їхній контент домішується при читанні умовою author IN (...);
+- коли автор після відписок повертається до межі, його останній контент
+  дописується в стрічки всіх підписників (followers_changed), інакше пости,
+  що домішувались при читанні, зникли б зі стрічок.
+
+Обидві частини об'єднуються одним запитом до Content, тому сторінка стрічки
+коштує фіксовану кількість запитів незалежно від кількості підписок.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q, Subquery
+
+from .models import Content, FeedEntry
+
+BATCH_SIZE = 1000
+
+# Межа fan-out перевіряється за followers_count з БД (об'єкт автора в запиті може бути
+# з кешу користувачів); запис, що вже є (паралельна підписка додала контент через add_author), пропускається
+FAN_OUT_SQL = (
+    'INSERT INTO contents_feedentry (user_id, content_id, author_id) '
+    'SELECT follow.from_user_id, content.id, content.author_id '
+    'FROM users_user_following follow '
+    'INNER JOIN users_user author ON author.id = follow.to_user_id '
+    'INNER JOIN contents_content content ON content.author_id = follow.to_user_id '
+    'WHERE follow.to_user_id = %s AND author.followers_count <= %s AND content.id IN ({content_ids}) '
+    'ON CONFLICT DO NOTHING'
+)
+
+
+def fanout_limit():
+    return getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', 1000)
+
+
+def backfill_size():
+    return getattr(settings, 'FEED_BACKFILL_SIZE', 50)
+
+
+def fan_out(content):
+    """Записує новий контент у стрічки підписників автора (якщо автор не популярний)"""
+    fan_out_many(content.author, [content])
+
+
+def fan_out_many(author, contents):
+    """
+    Нові записи одного автора - у стрічки його підписників. Пари (підписник, контент)
+    складає БД одним INSERT ... SELECT на BATCH_SIZE записів: при масовому створенні
+    це тисячі рядків на кожного підписника, і об'єкти FeedEntry в Python коштували б секунди
+    """
+    if not contents:
+        return
+    _insert_for_followers(author, [content.pk for content in contents])
+
+
+def _insert_for_followers(author, content_ids):
+    with connection.cursor() as cursor:
+        for start in range(0, len(content_ids), BATCH_SIZE):
+            batch = content_ids[start:start + BATCH_SIZE]
+            cursor.execute(FAN_OUT_SQL.format(content_ids=', '.join(['%s'] * len(batch))), [author.pk, fanout_limit(), *batch])
+
+
+def add_author(user, author):
+    """Після підписки - останній контент автора в стрічку"""
+    if author.followers_count > fanout_limit():
+        return
+    content_ids = Content.objects.filter(author=author).order_by('-created_at').values_list('pk', flat=True)
+    FeedEntry.objects.bulk_create(
+        [FeedEntry(user=user, content_id=pk, author=author) for pk in content_ids[:backfill_size()]],
+        ignore_conflicts=True,
+    )
+
+
+def followers_changed(author, previous_count):
+    """
+    Кількість підписників автора змінилась з previous_count на author.followers_count.
+    Якщо автор перестав бути популярним - його останній контент (як при підписці)
+    у стрічки всіх підписників: до цього він домішувався при читанні
+    """
+    if author.followers_count <= fanout_limit() < previous_count:
+        content_ids = Content.objects.filter(author=author).order_by('-created_at').values_list('pk', flat=True)
+        _insert_for_followers(author, list(content_ids[:backfill_size()]))
+
+
+def remove_author(user, author):
+    """Після відписки - прибираємо контент автора зі стрічки"""
+    FeedEntry.objects.filter(user=user, author=author).delete()
+
+
+def feed_queryset(user):
+    """
+    Публічний контент зі стрічки користувача: записи FeedEntry
+    плюс контент популярних авторів, на яких він підписаний
+    """
+    User = get_user_model()
+    stored = FeedEntry.objects.filter(user=user).values('content')
+    popular_authors = User.following.through.objects.filter(
+        from_user=user, to_user__followers_count__gt=fanout_limit()
+    ).values('to_user')
+    return Content.objects.filter(is_public=True).filter(
+        Q(pk__in=Subquery(stored)) | Q(author__in=Subquery(popular_authors))
+    )
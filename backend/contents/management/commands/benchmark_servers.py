@@ -0,0 +1,285 @@
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from scientific_discoveries import benchmark
+
+# Гарячі маршрути читання, на які йде навантаження
+HOT_ROUTES = ('content-list', 'content-detail', 'content-comments', 'user-detail')
+
+# Однакова кількість воркерів gunicorn = однаковий бюджет пам'яті (процес Django на воркер)
+SERVERS = {
+    'wsgi': ['scientific_discoveries.wsgi'],
+    'asgi': ['scientific_discoveries.asgi', '--worker-class', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Start the WSGI (sync gunicorn workers) and ASGI (uvicorn workers) deployments with the same '
+        'number of workers one after another, load the hot read routes over HTTP and print throughput, '
+        'latency and server memory as JSON. Run on data from seed_benchmark'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--server', action='append', choices=sorted(SERVERS),
+            help='Deployment to measure, repeatable (default: both)'
+        )
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers (default: 2)')
+        parser.add_argument(
+            '--concurrency', type=int, default=16, help='Concurrent client connections (default: 16)'
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10, help='Seconds of load per deployment (default: 10)'
+        )
+        parser.add_argument(
+            '--slow-clients', type=int, default=0,
+            help='Extra clients that trickle their request headers over --slow-seconds, '
+                 'like users on a slow network (default: 0)'
+        )
+        parser.add_argument(
+            '--slow-seconds', type=float, default=2, help='How long a slow client sends one request (default: 2)'
+        )
+        parser.add_argument(
+            '--authenticated', action='store_true',
+            help='Send requests with a JWT (bypasses the anonymous response cache)'
+        )
+        parser.add_argument('--port', type=int, default=8765, help='Port for the servers (default: 8765)')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--workers and --concurrency must be at least 1')
+
+        paths = self.hot_paths()
+        headers = {'Host': 'localhost', 'Connection': 'close'}
+        if options['authenticated']:
+            viewer = benchmark.benchmark_viewer()
+            if viewer is None:
+                raise CommandError('No user with contents to authenticate as; run seed_benchmark first')
+            headers['Authorization'] = f'Bearer {AccessToken.for_user(viewer)}'
+
+        results = {}
+        for name in options['server'] or SERVERS:
+            self.stderr.write(f'{name}: {options["workers"]} workers, {options["duration"]:g}s of load...')
+            results[name] = self.measure(name, paths, headers, options)
+            self.stderr.write(
+                f'{name}: {results[name]["requests_per_second"]} req/s, '
+                f'p95 {results[name]["p95_ms"]} ms, {results[name]["errors"]} errors, '
+                f'RSS {results[name]["rss_mb"]} MB'
+            )
+
+        report = {
+            'meta': {
+                'commit': benchmark.git_commit(),
+                'created_at': timezone.now().isoformat(),
+                'cpus': os.cpu_count(),
+                'workers': options['workers'],
+                'concurrency': options['concurrency'],
+                'slow_clients': options['slow_clients'],
+                'duration': options['duration'],
+                'authenticated': options['authenticated'],
+                'paths': paths,
+            },
+            'results': results,
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output + '\n')
+            self.stderr.write(f'Wrote report to {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+    def hot_paths(self):
+        samples = benchmark.sample_kwargs()
+        paths = []
+        for route in benchmark.discover_routes():
+            if route.name in HOT_ROUTES:
+                try:
+                    paths.append(quote(route.template.format(**samples.get(route.name.rsplit('-', 1)[0], {}))))
+                except KeyError:
+                    continue  # Немає даних для параметрів шляху
+        if not paths:
+            raise CommandError('No data for the hot routes; run seed_benchmark first')
+        return paths
+
+    def measure(self, name, paths, headers, options):
+        port = options['port']
+        process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', *SERVERS[name],
+                '--workers', str(options['workers']), '--bind', f'127.0.0.1:{port}',
+                '--log-level', 'warning',
+            ],
+            cwd=settings.BASE_DIR,
+        )
+        try:
+            self.wait_ready(process, port, paths[0], headers)
+            load = Load(
+                port, paths, headers, options['concurrency'], options['slow_clients'], options['slow_seconds']
+            )
+            rss = load.run(options['duration'], lambda: process_tree_rss(process.pid))
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return load.summary(rss)
+
+    def wait_ready(self, process, port, path, headers, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with code {process.returncode}')
+            try:
+                status, _ = request(port, path, headers, timeout=5)
+            except OSError:
+                time.sleep(0.2)
+                continue
+            if status != 200:
+                raise CommandError(f'GET {path} returned {status}')
+            return
+        raise CommandError(f'Server did not answer on port {port} within {timeout}s')
+
+
+def request(port, path, headers, timeout=30):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, body
+    finally:
+        connection.close()
+
+
+def process_tree_rss(pid):
+    """Сумарний RSS процесу і його нащадків у байтах (Linux /proc), None - якщо недоступно"""
+    children = {}
+    try:
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat') as file:
+                    parent = int(file.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(parent, []).append(int(entry))
+    except OSError:
+        return None
+
+    total, stack = 0, [pid]
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, ()))
+        try:
+            with open(f'/proc/{current}/statm') as file:
+                total += int(file.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class Load:
+    """
+    Клієнти в потоках: кожен по колу запитує paths (нове з'єднання на запит, як
+    у sync-воркерів gunicorn без keep-alive). Повільні клієнти надсилають заголовки
+    по байту протягом slow_seconds і в статистику не входять
+    """
+
+    def __init__(self, port, paths, headers, concurrency, slow_clients, slow_seconds):
+        self.port = port
+        self.paths = paths
+        self.headers = headers
+        self.concurrency = concurrency
+        self.slow_clients = slow_clients
+        self.slow_seconds = slow_seconds
+        self.lock = threading.Lock()
+        self.timings = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def run(self, duration, sample_rss):
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=self.client, args=(index, stop), daemon=True)
+            for index in range(self.concurrency)
+        ] + [
+            threading.Thread(target=self.slow_client, args=(stop,), daemon=True)
+            for _ in range(self.slow_clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        peak_rss = None
+        while time.perf_counter() - started < duration:
+            time.sleep(min(0.5, duration))
+            rss = sample_rss()
+            if rss is not None:
+                peak_rss = max(peak_rss or 0, rss)
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=60)
+        self.elapsed = time.perf_counter() - started
+        return peak_rss
+
+    def client(self, index, stop):
+        position = index
+        while not stop.is_set():
+            path = self.paths[position % len(self.paths)]
+            position += 1
+            started = time.perf_counter()
+            try:
+                status, _ = request(self.port, path, self.headers)
+                ok = status == 200
+            except OSError:
+                ok = False
+            with self.lock:
+                if ok:
+                    self.timings.append((time.perf_counter() - started) * 1000)
+                else:
+                    self.errors += 1
+
+    def slow_client(self, stop):
+        payload = (
+            f'GET {self.paths[0]} HTTP/1.1\r\nHost: {self.headers["Host"]}\r\nConnection: close\r\n\r\n'
+        ).encode()
+        delay = self.slow_seconds / len(payload)
+        while not stop.is_set():
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=60) as sock:
+                    for byte in payload:
+                        sock.sendall(bytes([byte]))
+                        time.sleep(delay)
+                    while sock.recv(65536):
+                        pass
+            except OSError:
+                time.sleep(0.1)
+
+    def summary(self, rss):
+        timings = self.timings or [0.0]
+        return {
+            'requests': len(self.timings),
+            'errors': self.errors,
+            'requests_per_second': round(len(self.timings) / self.elapsed, 1) if self.elapsed else 0,
+            'p50_ms': round(benchmark.percentile(timings, 50), 1),
+            'p95_ms': round(benchmark.percentile(timings, 95), 1),
+            'p99_ms': round(benchmark.percentile(timings, 99), 1),
+            'rss_mb': round(rss / 2 ** 20, 1) if rss is not None else None,
+        }
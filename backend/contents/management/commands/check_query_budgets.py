@@ -0,0 +1,142 @@
+from collections import Counter
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from scientific_discoveries import benchmark
+from scientific_discoveries.metrics import fingerprint
+
+# Максимальна кількість SQL-запитів на запит до маршруту: (ім'я маршруту, auth) -> бюджет.
+# Кеші вимкнені, тому це вартість "холодного" запиту. Новий маршрут без бюджету - помилка
+QUERY_BUDGETS = {
+    ('user-list', 'anonymous'): 4,
+    ('user-list', 'user'): 5,
+    ('user-autocomplete', 'anonymous'): 1,
+    ('user-autocomplete', 'user'): 2,
+    ('user-me', 'user'): 2,
+    ('user-detail', 'anonymous'): 2,
+    ('user-detail', 'user'): 3,
+    ('user-contents', 'anonymous'): 3,
+    ('user-contents', 'user'): 4,
+    ('user-followers', 'anonymous'): 2,
+    ('user-followers', 'user'): 3,
+    ('user-following', 'anonymous'): 2,
+    ('user-following', 'user'): 3,
+    ('user-overview', 'anonymous'): 5,
+    ('user-overview', 'user'): 7,
+    ('field-list', 'anonymous'): 2,
+    ('field-list', 'user'): 3,
+    ('field-detail', 'anonymous'): 1,
+    ('field-detail', 'user'): 2,
+    ('content-list', 'anonymous'): 5,
+    ('content-list', 'user'): 6,
+    ('content-feed', 'user'): 3,
+    ('content-my', 'user'): 3,
+    ('content-detail', 'anonymous'): 6,
+    ('content-detail', 'user'): 7,
+    ('content-comments', 'anonymous'): 4,
+    ('content-comments', 'user'): 5,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Check that every GET route of contents/urls.py and users/urls.py runs the same number '
+        'of SQL queries on a dataset of size N and 10*N (and with different page sizes), '
+        'within its budget. Uses a throwaway test database; exits non-zero on violations'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size', type=int, default=30,
+            help='N: users in the small dataset, other tables scale with it (default: 30)'
+        )
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help='Send requests through the ASGI handler (async read views) instead of WSGI'
+        )
+
+    def handle(self, *args, **options):
+        size = options['size']
+        if size < 10:
+            raise CommandError('--size must be at least 10')
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Кеші приховали б вартість серіалізації, відкладені записи - зробили б її плаваючою
+            with override_settings(
+                RESPONSE_CACHE_TIMEOUT=0, AUTH_USER_CACHE_TTL=0,
+                VIEW_COUNT_FLUSH_INTERVAL=0, AVATAR_THUMBNAILS_ASYNC=False,
+            ):
+                small = self.measure(size, page_size=5, asgi=options['asgi'])
+                large = self.measure(size * 10, page_size=50, asgi=options['asgi'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        failures = 0
+        for key, result in sorted(large.items()):
+            before = small.get(key)
+            budget = QUERY_BUDGETS.get((result.name, result.auth))
+            label = self.label(result)
+            problems = []
+            if budget is None:
+                problems.append(f'no budget in QUERY_BUDGETS for ({result.name!r}, {result.auth!r})')
+            elif result.queries > budget:
+                problems.append(f'{result.queries:g} queries, budget {budget}')
+            if before is not None and before.queries != result.queries:
+                problems.append(
+                    f'{before.queries:g} queries at N={size} but {result.queries:g} at N={size * 10}'
+                )
+
+            if not problems:
+                self.stdout.write(f'ok    {label:<60} {result.queries:g}/{budget}')
+                continue
+            failures += 1
+            self.stdout.write(self.style.ERROR(f'FAIL  {label:<60} {"; ".join(problems)}'))
+            self.report_repeated(result, before)
+
+        if failures:
+            raise CommandError(f'{failures} route(s) exceeded their query budget')
+        self.stdout.write(self.style.SUCCESS(f'All {len(large)} routes are within their query budgets'))
+
+    def measure(self, size, page_size, asgi=False):
+        call_command(
+            'seed_benchmark', users=size, institutions=max(size // 10, 2), contents=size * 2,
+            likes=size * 5, comments=size * 3, follows=size * 5, clear=True, stdout=StringIO(),
+        )
+        viewer = benchmark.benchmark_viewer()
+        results = benchmark.run(
+            benchmark.discover_routes(), benchmark.sample_kwargs(),
+            token=str(AccessToken.for_user(viewer)), iterations=1, warmup=1,
+            common_params={'page_size': page_size}, asgi=asgi,
+        )
+        return {
+            (result.route, result.auth, tuple(sorted(result.params.items()))): result
+            for result in results
+        }
+
+    def label(self, result):
+        params = '&'.join(f'{key}={value}' for key, value in result.params.items())
+        return f'{result.auth:<9} {result.route}' + (f'?{params}' if params else '')
+
+    def report_repeated(self, result, before):
+        """
+        SQL, що виконувався більше одного разу або частіше, ніж на малому наборі.
+        Якщо таких немає (просто зайвий запит) - скорочено всі запити маршруту
+        """
+        counts = Counter(fingerprint(sql) for sql in result.statements)
+        previous = Counter(fingerprint(sql) for sql in before.statements) if before else Counter()
+        suspects = [
+            (statement, count) for statement, count in counts.most_common()
+            if count > 1 or count != previous[statement]
+        ]
+        if suspects:
+            for statement, count in suspects:
+                self.stdout.write(f'        {previous[statement]} -> {count}x  {statement}')
+            return
+        for statement, count in counts.items():
+            self.stdout.write(f'        {count}x  {statement[:160]}')
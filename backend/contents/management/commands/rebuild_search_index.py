@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from contents import search
+from contents.models import Content
+from users import search as users_search
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search indexes for all content and users'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of items indexed per transaction (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        backend = search.get_backend()
+        if backend is None:
+            self.stdout.write(self.style.WARNING(
+                f'Full-text search is not supported on {connection.vendor}, skipping'
+            ))
+            return
+
+        chunk_size = options['chunk_size']
+        contents = self._rebuild(
+            backend, Content.objects.only('pk', *search.INDEXED_FIELDS),
+            search.document_for, chunk_size
+        )
+        users = self._rebuild(
+            users_search.get_backend(), User.objects.select_related('institution'),
+            users_search.document_for, chunk_size
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {contents} contents and {users} users'))
+
+    def _rebuild(self, backend, queryset, document_for, chunk_size):
+        """Індексує queryset діапазонами первинних ключів - одна транзакція на чанк"""
+        queryset = queryset.order_by('pk')
+        total = 0
+        last_pk = 0
+        while True:
+            chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic(), connection.cursor() as cursor:
+                for obj in chunk:
+                    backend.index(cursor, obj.pk, document_for(obj))
+            total += len(chunk)
+            last_pk = chunk[-1].pk
+        return total
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef
+
+from contents import feed
+from contents.models import Content, Comment, Like
+from contents.queries import count_subquery
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized like/comment/reply and follower counters in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of rows updated per transaction (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        contents = self._recount(Content, chunk_size, {
+            'likes_count': count_subquery(Like.objects.filter(content=OuterRef('pk')), 'content'),
+            'comments_count': count_subquery(Comment.objects.filter(content=OuterRef('pk')), 'content'),
+        })
+        comments = self._recount(Comment, chunk_size, {
+            'replies_count': count_subquery(Comment.objects.filter(parent=OuterRef('pk')), 'parent'),
+        })
+
+        User = get_user_model()
+        follows = User.following.through.objects
+        # Популярних авторів небагато: запам'ятовуємо, щоб помітити тих, хто опуститься до межі fan-out
+        popular = dict(
+            User.objects.filter(followers_count__gt=feed.fanout_limit()).values_list('pk', 'followers_count')
+        )
+        users = self._recount(User, chunk_size, {
+            'followers_count': count_subquery(follows.filter(to_user=OuterRef('pk')), 'to_user'),
+            'following_count': count_subquery(follows.filter(from_user=OuterRef('pk')), 'from_user'),
+        })
+        for author in User.objects.filter(pk__in=popular, followers_count__lte=feed.fanout_limit()):
+            feed.followers_changed(author, popular[author.pk])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recounted {contents} contents, {comments} comments and {users} users'
+        ))
+
+    def _recount(self, model, chunk_size, counters):
+        """Оновлює лічильники діапазонами первинних ключів - один UPDATE на чанк"""
+        pks = model.objects.order_by('pk').values_list('pk', flat=True)
+        total = 0
+        last_pk = 0
+        while True:
+            chunk = list(pks.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                model.objects.filter(pk__gte=chunk[0], pk__lte=chunk[-1]).update(**counters)
+            total += len(chunk)
+            last_pk = chunk[-1]
+        return total
@@ -0,0 +1,108 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from contents.models import Content, Comment, Like
+from scientific_discoveries import benchmark
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every GET route of contents/urls.py and users/urls.py in-process and print '
+        'p50/p95/p99 latency, queries and rows per request as JSON. Run on data from '
+        'seed_benchmark with DEBUG=False for representative latency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, default=20, help='Measured requests per route (default: 20)'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=2, help='Unmeasured requests per route first (default: 2)'
+        )
+        parser.add_argument('--route', help='Only routes whose path or name contains this text')
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help='Send requests through the ASGI handler (async read views) instead of WSGI'
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument(
+            '--compare', metavar='BASELINE',
+            help='JSON report of a previous run: print p95 and query deltas against it'
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        routes = benchmark.discover_routes()
+        if options['route']:
+            routes = [
+                route for route in routes
+                if options['route'] in route.template or options['route'] in (route.name or '')
+            ]
+        viewer = benchmark.benchmark_viewer()
+        token = str(AccessToken.for_user(viewer)) if viewer else None
+
+        results = benchmark.run(
+            routes, benchmark.sample_kwargs(), token=token,
+            iterations=options['iterations'], warmup=max(options['warmup'], 0), asgi=options['asgi'],
+        )
+        report = {
+            'meta': {
+                'commit': benchmark.git_commit(),
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+                'handler': 'asgi' if options['asgi'] else 'wsgi',
+                'iterations': options['iterations'],
+                'dataset': {
+                    'users': User.objects.count(),
+                    'contents': Content.objects.count(),
+                    'likes': Like.objects.count(),
+                    'comments': Comment.objects.count(),
+                    'follows': User.following.through.objects.count(),
+                },
+            },
+            'results': [benchmark.as_dict(result) for result in results],
+        }
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output + '\n')
+            self.stderr.write(f'Wrote {len(results)} results to {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            self.compare(report, options['compare'])
+
+    def compare(self, report, path):
+        try:
+            with open(path, encoding='utf-8') as file:
+                baseline = {benchmark.result_key(entry): entry for entry in json.load(file)['results']}
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+        self.stderr.write(f'{"route":<60} {"auth":<9} {"p95 ms":>16} {"queries":>10}')
+        for entry in report['results']:
+            old = baseline.get(benchmark.result_key(entry))
+            params = '&'.join(f'{key}={value}' for key, value in entry['params'].items())
+            label = entry['route'] + (f'?{params}' if params else '')
+            if old is None:
+                self.stderr.write(f'{label:<60} {entry["auth"]:<9} {"new":>16}')
+                continue
+            change = (entry['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+            self.stderr.write(
+                f'{label:<60} {entry["auth"]:<9} '
+                f'{entry["p95_ms"]:>8.2f} ({change:+5.0f}%) '
+                f'{old["queries"]:>4g} -> {entry["queries"]:g}'
+            )
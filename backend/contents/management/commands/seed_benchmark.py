@@ -0,0 +1,339 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from contents import feed
+from contents.models import (
+    Content, ContentType, ContentStatus, ScientificField, Like, Comment, FeedEntry,
+    build_base_slug,
+)
+from users.models import Institution, UserRole, EducationLevel
+
+User = get_user_model()
+
+# Користувачі набору даних відрізняються доменом email (--clear видаляє тільки їх)
+EMAIL_DOMAIN = 'benchmark.invalid'
+PASSWORD = 'benchmark'
+BATCH_SIZE = 1000
+
+FIRST_NAMES = (
+    'Олена', 'Андрій', 'Ірина', 'Тарас', 'Марія', 'Богдан', 'Оксана', 'Дмитро',
+    'Наталія', 'Олександр', 'Юлія', 'Максим', 'Софія', 'Василь', 'Катерина', 'Ярослав',
+)
+LAST_NAMES = (
+    'Шевченко', 'Коваленко', 'Бондаренко', 'Ткаченко', 'Кравченко', 'Олійник', 'Мельник',
+    'Поліщук', 'Лисенко', 'Гончаренко', 'Руденко', 'Савченко', 'Петренко', 'Марченко',
+)
+CITIES = (
+    'Київський', 'Львівський', 'Харківський', 'Одеський', 'Дніпровський', 'Чернівецький',
+    'Вінницький', 'Полтавський', 'Житомирський', 'Запорізький', 'Ужгородський', 'Сумський',
+)
+KINDS = (
+    'національний університет', 'політехнічний інститут', 'медичний університет',
+    'аграрний університет', 'педагогічний університет', 'технічний університет',
+    'інститут фізики', 'інститут біології',
+)
+TOPIC_WORDS = (
+    'нейронні', 'мережі', 'квантові', 'обчислення', 'кліматичні', 'моделі', 'геноміка',
+    'білки', 'графен', 'батареї', 'сонячна', 'енергетика', 'машинне', 'навчання',
+    'епідеміологія', 'вакцини', 'астрофізика', 'екзопланети', 'лінгвістика', 'корпуси',
+    'роботи', 'сенсори', 'мікробіом', 'ґрунти', 'урбаністика', 'транспорт', 'оптика',
+    'лазери', 'статистика', 'експерименти', 'історія', 'архіви', 'етика', 'даних',
+)
+COMMENT_PHRASES = (
+    'Цікава ідея, дякую!', 'Чи є посилання на дані?', 'Готовий долучитись до проєкту.',
+    'Схожі результати бачили в нашій лабораторії.', 'А як з відтворюваністю?',
+    'Коли буде запис вебінару?', 'Підтримую, варто розвивати.', 'Можна детальніше про методику?',
+)
+
+
+def power_law(n, exponent):
+    """
+    Кумулятивні ваги для random.choices: елемент рангу i обирається
+    пропорційно 1 / (i + 1) ** exponent (закон Ципфа)
+    """
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(n)))
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    auto_now / auto_now_add перезаписують дати при вставці, а набору даних
+    потрібні дати, розподілені в часі - на час генерації вимикаємо їх
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a realistic benchmark dataset: users, institutions, content of every type, '
+        'likes, threaded comments and follows with power-law popularity'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000, help='Number of users (default: 2000)')
+        parser.add_argument(
+            '--institutions', type=int, default=100, help='Number of institutions (default: 100)'
+        )
+        parser.add_argument('--contents', type=int, default=10000, help='Number of contents (default: 10000)')
+        parser.add_argument('--likes', type=int, default=50000, help='Number of likes (default: 50000)')
+        parser.add_argument(
+            '--comments', type=int, default=20000,
+            help='Number of comments, about a third of them replies (default: 20000)'
+        )
+        parser.add_argument('--follows', type=int, default=20000, help='Number of follows (default: 20000)')
+        parser.add_argument(
+            '--exponent', type=float, default=1.1,
+            help='Power-law exponent of user and content popularity (default: 1.1)'
+        )
+        parser.add_argument('--days', type=int, default=365, help='Spread dates over this many days (default: 365)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--clear', action='store_true',
+            help=f'Delete users with @{EMAIL_DOMAIN} emails (and everything they created) first'
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.exponent = options['exponent']
+        self.now = timezone.now()
+        self.start = self.now - timedelta(days=options['days'])
+        self.started = time.monotonic()
+
+        existing = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError('Benchmark data already exists, use --clear to replace it')
+            deleted, _ = existing.delete()
+            self.log(f'Deleted {deleted} rows of previous benchmark data')
+
+        self.fields = list(ScientificField.objects.values_list('pk', flat=True))
+        if not self.fields:
+            raise CommandError('No scientific fields, run migrations first')
+        if options['users'] < 2:
+            raise CommandError('At least 2 users are required')
+
+        with explicit_timestamps(User, Content, Like, Comment):
+            institutions = self.create_institutions(options['institutions'])
+            users = self.create_users(options['users'], institutions)
+            contents = self.create_contents(options['contents'], users)
+            self.create_likes(options['likes'], users, contents)
+            self.create_comments(options['comments'], users, contents)
+            follows = self.create_follows(options['follows'], users)
+        self.fill_feeds(follows, contents)
+
+        # Лічильники і пошукові індекси - тими ж командами, що й для робочої бази
+        call_command('recount_counters', verbosity=0)
+        call_command('rebuild_search_index', verbosity=0)
+        self.stdout.write(self.style.SUCCESS(
+            f'Benchmark dataset generated in {time.monotonic() - self.started:.1f}s '
+            f'(password for all users: "{PASSWORD}")'
+        ))
+
+    def log(self, message):
+        self.stdout.write(f'[{time.monotonic() - self.started:6.1f}s] {message}')
+
+    def moment(self, after=None):
+        """Випадковий момент між after (або початком періоду) і зараз"""
+        start = after or self.start
+        return start + (self.now - start) * self.random.random()
+
+    def popular(self, population, k):
+        """k елементів population (з повтореннями), популярність за законом Ципфа"""
+        weights = power_law(len(population), self.exponent)
+        return self.random.choices(population, cum_weights=weights, k=k)
+
+    def ranked(self, objects):
+        """Рейтинг популярності не повинен збігатися з порядком створення"""
+        objects = list(objects)
+        self.random.shuffle(objects)
+        return objects
+
+    def create_institutions(self, count):
+        """Назви детерміновані, тому повторний запуск використовує ті самі заклади"""
+        names = [
+            f'{CITIES[i % len(CITIES)]} {KINDS[i // len(CITIES) % len(KINDS)]} №{i + 1}'
+            for i in range(count)
+        ]
+        Institution.objects.bulk_create(
+            [Institution(name=name) for name in names], batch_size=BATCH_SIZE, ignore_conflicts=True
+        )
+        institutions = list(Institution.objects.filter(name__in=names).values_list('pk', flat=True))
+        self.log(f'{len(institutions)} institutions')
+        return institutions
+
+    def create_users(self, count, institutions):
+        # Хешування - найдорожча частина; всі користувачі отримують один і той самий хеш
+        password = make_password(PASSWORD)
+        roles = UserRole.values
+        levels = EducationLevel.values
+        picked = self.popular(self.ranked(institutions), count) if institutions else [None] * count
+        users = []
+        for i in range(count):
+            created_at = self.moment()
+            users.append(User(
+                email=f'user{i}@{EMAIL_DOMAIN}',
+                username=f'bench-user-{i}',
+                first_name=self.random.choice(FIRST_NAMES),
+                last_name=self.random.choice(LAST_NAMES),
+                password=password,
+                role=self.random.choice(roles),
+                education_level=self.random.choice(levels),
+                institution_id=picked[i],
+                bio=' '.join(self.random.sample(TOPIC_WORDS, 8)),
+                scientific_interests=', '.join(self.random.sample(TOPIC_WORDS, 3)),
+                date_joined=created_at,
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        self.log(f'{len(users)} users')
+        return self.ranked(users)
+
+    def create_contents(self, count, users):
+        types = ContentType.values
+        statuses = ContentStatus.values
+        contents = []
+        for i, author in enumerate(self.popular(users, count)):
+            title = ' '.join(self.random.sample(TOPIC_WORDS, self.random.randint(3, 6))).capitalize()
+            created_at = self.moment(after=author.created_at)
+            contents.append(Content(
+                content_type=types[i % len(types)],
+                title=title,
+                # Порядковий номер робить slug унікальним без перевірок у БД
+                slug=f'{build_base_slug(title)[:70]}-{i}',
+                description=' '.join(self.random.choices(TOPIC_WORDS, k=40)),
+                author=author,
+                keywords=', '.join(self.random.sample(TOPIC_WORDS, 4)),
+                status=self.random.choice(statuses),
+                is_public=self.random.random() < 0.9,
+                is_open_for_collaboration=self.random.random() < 0.5,
+                views_count=int(self.random.paretovariate(1.2) * 10),
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        with transaction.atomic():
+            Content.objects.bulk_create(contents, batch_size=BATCH_SIZE)
+            Through = Content.scientific_fields.through
+            Through.objects.bulk_create(
+                (
+                    Through(content_id=content.pk, scientificfield_id=field)
+                    for content in contents
+                    for field in self.random.sample(self.fields, min(len(self.fields), self.random.randint(1, 3)))
+                ),
+                batch_size=BATCH_SIZE,
+            )
+        self.log(f'{len(contents)} contents')
+        return self.ranked(contents)
+
+    def unique_pairs(self, count, left, right, exclude=lambda a, b: False):
+        """
+        До count унікальних пар (a, b): a - рівномірно, b - за популярністю.
+        Коли популярних пар не вистачає, спроби обмежені, щоб не зациклитись
+        """
+        pairs = {}
+        attempts = 0
+        while len(pairs) < count and attempts < 5:
+            missing = count - len(pairs)
+            for b in self.popular(right, missing):
+                a = self.random.choice(left)
+                if not exclude(a, b):
+                    pairs.setdefault((a.pk, b.pk), (a, b))
+            attempts += 1
+        return list(pairs.values())[:count]
+
+    def create_likes(self, count, users, contents):
+        likes = [
+            Like(content=content, user=user, created_at=self.moment(after=content.created_at))
+            for user, content in self.unique_pairs(count, users, contents)
+        ]
+        with transaction.atomic():
+            Like.objects.bulk_create(likes, batch_size=BATCH_SIZE)
+        self.log(f'{len(likes)} likes')
+
+    def create_comments(self, count, users, contents):
+        """Дві третини - коментарі верхнього рівня, решта - відповіді на них"""
+        top_level = [
+            Comment(
+                content=content,
+                author=self.random.choice(users),
+                text=self.random.choice(COMMENT_PHRASES),
+                created_at=self.moment(after=content.created_at),
+            )
+            for content in self.popular(contents, count - count // 3)
+        ]
+        with transaction.atomic():
+            Comment.objects.bulk_create(top_level, batch_size=BATCH_SIZE)
+
+        replies = []
+        if top_level:
+            # Обговорення концентруються в популярних гілках
+            for parent in self.popular(self.ranked(top_level), count // 3):
+                replies.append(Comment(
+                    content_id=parent.content_id,
+                    parent=parent,
+                    author=self.random.choice(users),
+                    text=self.random.choice(COMMENT_PHRASES),
+                    created_at=self.moment(after=parent.created_at),
+                ))
+            with transaction.atomic():
+                Comment.objects.bulk_create(replies, batch_size=BATCH_SIZE)
+        self.log(f'{len(top_level)} comments and {len(replies)} replies')
+
+    def create_follows(self, count, users):
+        Follow = User.following.through
+        pairs = self.unique_pairs(count, users, users, exclude=lambda a, b: a.pk == b.pk)
+        with transaction.atomic():
+            Follow.objects.bulk_create(
+                [Follow(from_user_id=follower.pk, to_user_id=author.pk) for follower, author in pairs],
+                batch_size=BATCH_SIZE,
+            )
+        self.log(f'{len(pairs)} follows')
+        return pairs
+
+    def fill_feeds(self, follows, contents):
+        """
+        Стрічки як після fan-out on write (див. contents/feed.py):
+        тільки автори з кількістю підписників до FEED_FANOUT_MAX_FOLLOWERS,
+        останні FEED_BACKFILL_SIZE публікацій кожного
+        """
+        followers = {}
+        for follower, author in follows:
+            followers.setdefault(author.pk, []).append(follower.pk)
+        latest = {}
+        for content in sorted(contents, key=lambda content: content.created_at, reverse=True):
+            by_author = latest.setdefault(content.author_id, [])
+            if len(by_author) < feed.backfill_size():
+                by_author.append(content.pk)
+
+        entries = (
+            FeedEntry(user_id=user_id, content_id=content_id, author_id=author_id)
+            for author_id, user_ids in followers.items()
+            if len(user_ids) <= feed.fanout_limit()
+            for user_id in user_ids
+            for content_id in latest.get(author_id, ())
+        )
+        with transaction.atomic():
+            FeedEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        self.log(f'Feeds for {len(followers)} authors')
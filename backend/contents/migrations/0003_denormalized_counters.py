@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-18 08:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    counts = queryset.order_by().values(group_by).annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Content = apps.get_model('contents', 'Content')
+    Comment = apps.get_model('contents', 'Comment')
+    Like = apps.get_model('contents', 'Like')
+
+    Content.objects.update(
+        likes_count=_count(Like.objects.filter(content=OuterRef('pk')), 'content'),
+        comments_count=_count(Comment.objects.filter(content=OuterRef('pk')), 'content'),
+    )
+    Comment.objects.update(
+        replies_count=_count(Comment.objects.filter(parent=OuterRef('pk')), 'parent'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0002_initial_scientific_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Відповіді'),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Коментарі'),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Лайки'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0 on 2026-10-18 08:07
+
+import contents.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+from contents import search
+
+
+def create_search_index(apps, schema_editor):
+    """Створюємо індекс під поточну СУБД і індексуємо наявний контент"""
+    backend = search.get_backend(schema_editor.connection)
+    if backend is None:
+        return
+    Content = apps.get_model('contents', 'Content')
+    with schema_editor.connection.cursor() as cursor:
+        backend.create_index(cursor)
+        for content in Content.objects.only('pk', *search.INDEXED_FIELDS).iterator(chunk_size=1000):
+            backend.index(cursor, content.pk, search.document_for(content))
+
+
+def drop_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection)
+    if backend is not None:
+        with schema_editor.connection.cursor() as cursor:
+            backend.drop_index(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0003_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentSearchEntry',
+            fields=[
+                ('content', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='contents.content')),
+                ('document', contents.search.SearchDocumentField()),
+            ],
+            options={
+                'db_table': 'contents_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
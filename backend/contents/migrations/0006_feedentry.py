@@ -0,0 +1,51 @@
+# Generated by Django 5.0 on 2026-10-18 08:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_feeds(apps, schema_editor):
+    """Стрічки для вже існуючих підписок (тільки автори з fan-out on write)"""
+    User = apps.get_model('users', 'User')
+    Content = apps.get_model('contents', 'Content')
+    FeedEntry = apps.get_model('contents', 'FeedEntry')
+    Follow = User.following.through
+    limit = getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', 1000)
+
+    follows = Follow.objects.filter(to_user__followers_count__lte=limit).order_by('pk')
+    for from_user_id, to_user_id in follows.values_list('from_user_id', 'to_user_id').iterator():
+        content_ids = Content.objects.filter(author_id=to_user_id).values_list('pk', flat=True)
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(user_id=from_user_id, content_id=pk, author_id=to_user_id) for pk in content_ids],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contents', '0005_content_author_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0007_follow_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('content', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='contents.content', verbose_name='Контент')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL, verbose_name='Користувач')),
+            ],
+            options={
+                'verbose_name': 'Запис стрічки',
+                'verbose_name_plural': 'Записи стрічки',
+                'indexes': [models.Index(fields=['user', 'author'], name='feedentry_user_author_idx')],
+                'unique_together': {('user', 'content')},
+            },
+        ),
+        migrations.RunPython(fill_feeds, migrations.RunPython.noop),
+    ]
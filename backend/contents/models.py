@@ -1,7 +1,12 @@
-from django.db import models
+import secrets
+import string
+
+from django.db import models, transaction, IntegrityError
 from django.conf import settings
 from django.utils.text import slugify
 
+from .search import SearchDocumentField, SEARCH_TABLE
+
 
 class ScientificField(models.Model):
     """Галузі науки"""
@@ -36,6 +41,39 @@ class ContentType(models.TextChoices):
     LECTURE = 'lecture', 'Гостьова лекція'
 
 
+SLUG_SUFFIX_ALPHABET = string.ascii_lowercase + string.digits
+SLUG_SUFFIX_LENGTH = 6
+
+
+def build_base_slug(title):
+    """slugify з allow_unicode для кирилиці, обмежуємо до 80 символів"""
+    return slugify(title, allow_unicode=True)[:80] or 'content'
+
+
+def slug_with_suffix(base_slug):
+    """Базовий slug + короткий випадковий суфікс (36^6 варіантів)"""
+    suffix = ''.join(secrets.choice(SLUG_SUFFIX_ALPHABET) for _ in range(SLUG_SUFFIX_LENGTH))
+    return f'{base_slug}-{suffix}'
+
+
+def allocate_slugs(titles):
+    """
+    Slug для кількох нових записів одним запитом до БД (масове створення):
+    базовий slug, якщо він вільний і в БД, і серед інших записів, інакше - з суфіксом.
+    Рідкісний збіг суфікса з існуючим slug ловиться унікальним індексом при вставці
+    """
+    base_slugs = [build_base_slug(title) for title in titles]
+    taken = set(Content.objects.filter(slug__in=set(base_slugs)).values_list('slug', flat=True))
+    slugs = []
+    for base_slug in base_slugs:
+        slug = base_slug
+        while slug in taken:
+            slug = slug_with_suffix(base_slug)
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
 class Content(models.Model):
     """Науковий контент: ідея / ресурс / вебінар / лекція"""
     content_type = models.CharField(
@@ -75,6 +113,9 @@ class Content(models.Model):
     is_open_for_collaboration = models.BooleanField('Відкритий для співпраці', default=True)
 
     views_count = models.PositiveIntegerField('Перегляди', default=0)
+    # Денормалізовані лічильники, оновлюються атомарно через F() у views
+    likes_count = models.PositiveIntegerField('Лайки', default=0)
+    comments_count = models.PositiveIntegerField('Коментарі', default=0)
 
     created_at = models.DateTimeField('Дата створення', auto_now_add=True)
     updated_at = models.DateTimeField('Дата оновлення', auto_now=True)
@@ -83,31 +124,70 @@ class Content(models.Model):
         verbose_name = 'Контент'
         verbose_name_plural = 'Контент'
         ordering = ['-created_at']
+        indexes = [
+            # Контент автора ("мій контент", профіль) від нових до старих
+            models.Index(fields=['author', '-created_at'], name='content_author_created_idx'),
+            # Стрічка контенту: обхід індексу в порядку сортування замість сортування всієї таблиці;
+            # умови is_public / author / status перевіряються по дорозі до першої сторінки
+            models.Index(fields=['-created_at', '-id'], name='content_created_idx'),
+            models.Index(fields=['-views_count', '-id'], name='content_views_idx'),
+            # Вкладки за типом контенту (публічний контент)
+            models.Index(
+                fields=['content_type', '-created_at', '-id'],
+                condition=models.Q(is_public=True),
+                name='content_public_type_idx',
+            ),
+        ]
+
+    # Скільки разів пробуємо інший суфікс, якщо slug зайняли паралельно
+    SLUG_ATTEMPTS = 5
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            # slugify з allow_unicode для кирилиці, обмежуємо до 80 символів
-            base_slug = slugify(self.title, allow_unicode=True)[:80]
-            if not base_slug:
-                # Якщо slug порожній - використовуємо timestamp
-                import time
-                base_slug = f"content-{int(time.time())}"
-            slug = base_slug
-            counter = 1
-            while Content.objects.filter(slug=slug).exists():
-                slug = f"{base_slug[:70]}-{counter}"  # залишаємо місце для лічильника
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        base_slug = build_base_slug(self.title)
+        # Один запит на перевірку базового slug; для дублікатів - випадковий
+        # суфікс замість перебору лічильника (кількість запитів не росте)
+        if Content.objects.filter(slug=base_slug).exists():
+            self.slug = slug_with_suffix(base_slug)
+        else:
+            self.slug = base_slug
 
-    @property
-    def likes_count(self):
-        return self.likes.count()
+        for attempt in range(self.SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # Інша помилка цілісності або закінчились спроби - пробрасуємо
+                if attempt == self.SLUG_ATTEMPTS - 1 or not Content.objects.filter(slug=self.slug).exists():
+                    raise
+                self.slug = slug_with_suffix(base_slug)
 
     def __str__(self):
         return self.title
 
 
+class ContentSearchEntry(models.Model):
+    """
+    Запис повнотекстового індексу контенту.
+    Таблиця створюється міграцією під конкретну СУБД і заповнюється
+    сигналами (див. search.py, signals.py), тому Django нею не керує.
+    """
+    content = models.OneToOneField(
+        Content,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_entry'
+    )
+    document = SearchDocumentField()
+
+    class Meta:
+        managed = False
+        db_table = SEARCH_TABLE
+
+
 class Like(models.Model):
     """Лайк до контенту"""
     content = models.ForeignKey(
@@ -156,12 +236,59 @@ class Comment(models.Model):
         verbose_name='Батьківський коментар'
     )
     text = models.TextField('Зміст')
+    replies_count = models.PositiveIntegerField('Відповіді', default=0)
     created_at = models.DateTimeField('Дата створення', auto_now_add=True)
 
     class Meta:
         verbose_name = 'Коментар'
         verbose_name_plural = 'Коментарі'
         ordering = ['created_at']
+        indexes = [
+            # Сторінки коментарів верхнього рівня і відповідей - у порядку (created_at, id)
+            models.Index(
+                fields=['content', 'created_at', 'id'],
+                condition=models.Q(parent__isnull=True),
+                name='comment_top_level_idx',
+            ),
+            models.Index(fields=['parent', 'created_at', 'id'], name='comment_parent_created_idx'),
+        ]
 
     def __str__(self):
         return f"Коментар від {self.author} до {self.content}"
+
+
+class FeedEntry(models.Model):
+    """
+    Запис у стрічці користувача: контент автора, на якого він підписаний.
+    Заповнюється при публікації (fan-out on write), див. contents/feed.py
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Користувач'
+    )
+    content = models.ForeignKey(
+        Content,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Контент'
+    )
+    # Дублює content.author, щоб відписка прибирала записи одним DELETE
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор'
+    )
+
+    class Meta:
+        verbose_name = 'Запис стрічки'
+        verbose_name_plural = 'Записи стрічки'
+        unique_together = ['user', 'content']
+        indexes = [
+            models.Index(fields=['user', 'author'], name='feedentry_user_author_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.content} у стрічці {self.user}"
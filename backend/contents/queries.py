@@ -0,0 +1,74 @@
+from django.db.models import Count, OuterRef, Subquery, Prefetch
+from django.db.models.functions import Coalesce
+
+from .models import Content, ScientificField, Comment
+
+# Скільки відповідей вбудовується в кожен коментар (решта - через ?parent=)
+REPLIES_PREVIEW_SIZE = 3
+
+
+def count_subquery(queryset, group_by):
+    """
+    Корельований підзапит COUNT(*) для анотації або UPDATE.
+
+    На відміну від Count() через JOIN не розмножує рядки основного запиту,
+    тому кілька лічильників можна анотувати одночасно без distinct.
+    """
+    counts = (
+        queryset.order_by()
+        .values(group_by)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def scientific_fields_with_counts():
+    """Галузі науки з анотованою кількістю контенту (contents_total)"""
+    through = Content.scientific_fields.through
+    return ScientificField.objects.annotate(
+        contents_total=count_subquery(
+            through.objects.filter(scientificfield=OuterRef('pk')),
+            'scientificfield'
+        )
+    )
+
+
+def with_list_relations(queryset):
+    """
+    Додає до queryset контенту все, що потрібно ContentListSerializer:
+    автора та галузі з лічильниками. Лайки й коментарі - денормалізовані
+    колонки, тож кількість запитів не залежить від розміру сторінки.
+    """
+    return queryset.select_related('author').prefetch_related(
+        Prefetch('scientific_fields', queryset=scientific_fields_with_counts())
+    )
+
+
+def author_contents(author, params, public_only=False):
+    """
+    Контент автора для "мого контенту" і профілю користувача
+    з опціональними фільтрами content_type / status.
+    Сортування за датою покривається індексом (author, created_at).
+    """
+    queryset = Content.objects.filter(author=author)
+    if public_only:
+        queryset = queryset.filter(is_public=True)
+    for name in ('content_type', 'status'):
+        value = params.get(name)
+        if value:
+            queryset = queryset.filter(**{name: value})
+    return with_list_relations(queryset.order_by('-created_at', '-pk'))
+
+
+def comment_tree(queryset):
+    """
+    Коментарі верхнього рівня разом з авторами і першими
+    REPLIES_PREVIEW_SIZE відповідями (атрибут preview_replies).
+    Дерево глибини 1 збирається двома запитами незалежно від кількості
+    коментарів: відповіді для всієї сторінки обмежуються віконною функцією.
+    """
+    replies = Comment.objects.select_related('author').order_by('created_at', 'pk')
+    return queryset.select_related('author').prefetch_related(
+        Prefetch('replies', queryset=replies[:REPLIES_PREVIEW_SIZE], to_attr='preview_replies')
+    )
@@ -0,0 +1,312 @@
+"""
+Повнотекстовий пошук.
+
+Індекс - окрема таблиця на модель: contents_search для контенту (див. міграцію 0004),
+users_search для користувачів (users/search.py):
+- SQLite: віртуальна таблиця FTS5, rowid = id запису;
+- PostgreSQL: колонка tsvector з GIN-індексом.
+
+Документ - три частини з вагами від більшої до меншої
+(для контенту: назва, ключові слова, опис).
+
+Токенізація і стемінг (українська + базова англійська) виконуються в Python
+однаково для документів і запитів, тому в БД використовується
+нейтральний словник 'simple' / токенізатор unicode61.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Func, Lookup, Q, TextField, Value
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+SEARCH_TABLE = 'contents_search'
+
+# Поля контенту, які потрапляють в індекс
+INDEXED_FIELDS = ('title', 'keywords', 'description')
+
+_APOSTROPHES = re.compile(r"['’ʼ`]")
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+_UK_VOWELS = 'аеиоуюяіїє'
+_UK_RV = re.compile(rf'^(.*?[{_UK_VOWELS}])(.*)$')
+# Групи закінчень у порядку спроб (довші варіанти першими всередині групи)
+_UK_PERFECTIVE = re.compile(r'(ившись|ивши|ив|вшись|вши)$')
+_UK_REFLEXIVE = re.compile(r'(ся|сь|си)$')
+_UK_ADJECTIVE = re.compile(
+    r'(ими|іми|ого|ому|ої|ій|ий|ім|им|ем|их|іх|ою|єє|еє|ів|йми|а|е|є|і|я|у|ю)$'
+)
+_UK_VERB = re.compile(
+    r'(ати|яти|ить|ать|ять|али|ило|ила|или|учи|ячи|ють|уть|ете|ите|ємо|имо|емо|ав|ив|ме|ти|е|є|у|ю)$'
+)
+_UK_NOUN = re.compile(
+    r'(ами|ями|ові|еві|єві|ах|ях|ям|ам|ом|ем|єм|ею|єю|ою|ів|їв|ей|ий|ій|а|е|є|и|і|ї|й|о|у|ю|я|ь)$'
+)
+_UK_DERIVATIONAL = re.compile(r'(ість|ост)$')
+
+_EN_SUFFIXES = re.compile(r'(ingly|edly|ing|ies|ied|ed|es|ly|s)$')
+
+
+def _stem_uk(word):
+    """Легкий стемер для української (варіант Snowball-підходу: відсікання в RV-зоні)"""
+    match = _UK_RV.match(word)
+    if not match:
+        return word
+    start, rv = match.groups()
+
+    for group in (_UK_PERFECTIVE, _UK_REFLEXIVE):
+        stripped = group.sub('', rv, count=1)
+        if stripped != rv:
+            rv = stripped
+            break
+
+    for group in (_UK_ADJECTIVE, _UK_VERB, _UK_NOUN):
+        stripped = group.sub('', rv, count=1)
+        if stripped != rv:
+            rv = stripped
+            break
+
+    rv = _UK_DERIVATIONAL.sub('', rv, count=1)
+    rv = rv.rstrip('ь')
+    if rv.endswith('нн'):
+        rv = rv[:-1]
+    stem = start + rv
+    # Занадто короткі стеми дають забагато збігів - лишаємо слово як є
+    return stem if len(stem) >= 3 else word
+
+
+def _stem_en(word):
+    if len(word) <= 4:
+        return word
+    return _EN_SUFFIXES.sub('', word, count=1)
+
+
+def tokenize(text):
+    """Розбиває текст на нормалізовані стеми"""
+    text = _APOSTROPHES.sub('', (text or '').lower()).replace('ё', 'е')
+    stems = []
+    for word in _WORD.findall(text):
+        if word.isdigit() or len(word) < 3:
+            stems.append(word)
+        elif re.search(r'[а-яіїєґ]', word):
+            stems.append(_stem_uk(word))
+        else:
+            stems.append(_stem_en(word))
+    return stems
+
+
+def build_document(*parts):
+    """Документ індексу з частин тексту (від найбільшої ваги до найменшої)"""
+    return tuple(' '.join(tokenize(part)) for part in parts)
+
+
+def document_for(content):
+    """Текст документа для індексу (назва має найбільшу вагу)"""
+    return build_document(content.title, content.keywords, content.description)
+
+
+class SQLiteBackend:
+    """FTS5: одна колонка document, вага частин - через повторення"""
+
+    def __init__(self, table=SEARCH_TABLE, references='contents_content'):
+        self.table = table
+
+    def create_index(self, cursor):
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} '
+            f"USING fts5(document, tokenize = 'unicode61 remove_diacritics 0')"
+        )
+
+    def drop_index(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    def index(self, cursor, rowid, document):
+        self.index_many(cursor, [(rowid, document)])
+
+    def index_many(self, cursor, documents):
+        """Індексує пари (rowid, документ): по одному executemany на видалення і вставку"""
+        rows = []
+        for rowid, (primary, secondary, body) in documents:
+            rows.append((rowid, ' '.join([primary, primary, primary, secondary, secondary, body])))
+        cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(rowid,) for rowid, _ in rows])
+        cursor.executemany(f'INSERT INTO {self.table} (rowid, document) VALUES (%s, %s)', rows)
+
+    def remove(self, cursor, rowid):
+        cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [rowid])
+
+    def build_query(self, stems):
+        return ' AND '.join(f'"{stem}"*' for stem in stems)
+
+
+class PostgreSQLBackend:
+    """tsvector з вагами A/B/C і GIN-індексом"""
+
+    def __init__(self, table=SEARCH_TABLE, references='contents_content'):
+        self.table = table
+        self.references = references
+
+    def create_index(self, cursor):
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            f'rowid bigint PRIMARY KEY REFERENCES {self.references} (id) '
+            f'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+            f'document tsvector NOT NULL)'
+        )
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {self.table}_document_gin '
+            f'ON {self.table} USING gin (document)'
+        )
+
+    def drop_index(self, cursor):
+        cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+    # Скільки документів вставляється одним INSERT (4 параметри на документ)
+    BATCH_SIZE = 500
+
+    def index(self, cursor, rowid, document):
+        self.index_many(cursor, [(rowid, document)])
+
+    def index_many(self, cursor, documents):
+        """Індексує пари (rowid, документ) багаторядковими INSERT ... ON CONFLICT"""
+        row = (
+            "(%s, setweight(to_tsvector('simple', %s), 'A') || "
+            "setweight(to_tsvector('simple', %s), 'B') || "
+            "setweight(to_tsvector('simple', %s), 'C'))"
+        )
+        documents = list(documents)
+        for start in range(0, len(documents), self.BATCH_SIZE):
+            batch = documents[start:start + self.BATCH_SIZE]
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, document) VALUES {", ".join([row] * len(batch))} '
+                f'ON CONFLICT (rowid) DO UPDATE SET document = EXCLUDED.document',
+                [value for rowid, document in batch for value in (rowid, *document)]
+            )
+
+    def remove(self, cursor, rowid):
+        cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [rowid])
+
+    def build_query(self, stems):
+        return ' & '.join(f'{stem}:*' for stem in stems)
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgreSQLBackend,
+}
+
+
+def get_backend(conn=None, **options):
+    """
+    Бекенд пошуку для з'єднання; None - якщо СУБД не підтримується.
+    options (table, references) - для індексів інших моделей
+    """
+    backend_class = BACKENDS.get((conn or connection).vendor)
+    return backend_class(**options) if backend_class else None
+
+
+def index_content(content, conn=None):
+    backend = get_backend(conn)
+    if backend:
+        with (conn or connection).cursor() as cursor:
+            backend.index(cursor, content.pk, document_for(content))
+
+
+def index_contents(contents, conn=None):
+    """Індексує кілька записів контенту (масове створення)"""
+    backend = get_backend(conn)
+    if backend:
+        with (conn or connection).cursor() as cursor:
+            backend.index_many(cursor, [(content.pk, document_for(content)) for content in contents])
+
+
+def remove_content(content_id, conn=None):
+    backend = get_backend(conn)
+    if backend:
+        with (conn or connection).cursor() as cursor:
+            backend.remove(cursor, content_id)
+
+
+class SearchDocumentField(TextField):
+    """Колонка документа індексу; підтримує лукап __match"""
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        if connection.vendor == 'postgresql':
+            return f"{lhs} @@ to_tsquery('simple', {rhs})", lhs_params + rhs_params
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class SearchRank(Func):
+    """Релевантність документа (більше - краще)"""
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # bm25() приймає ім'я (аліас) таблиці FTS5 і повертає від'ємне значення
+        alias = compiler.quote_name_unless_alias(self.source_expressions[0].alias)
+        return f'-bm25({alias})', []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        document, document_params = compiler.compile(self.source_expressions[0])
+        query, query_params = compiler.compile(self.source_expressions[1])
+        return (
+            f"ts_rank_cd({document}, to_tsquery('simple', {query}))",
+            document_params + query_params
+        )
+
+
+class FullTextSearchFilter(filters.BaseFilterBackend):
+    """
+    Пошук по індексу contents_search з ранжуванням за релевантністю.
+
+    Застосовується до вже відфільтрованого queryset, тому правила видимості
+    (is_public / автор) зберігаються. Якщо клієнт не передав ordering,
+    результати сортуються за релевантністю.
+
+    Для інших моделей достатньо змінити fallback_fields: зв'язок
+    з таблицею індексу має називатись search_entry.
+    """
+    search_param = api_settings.SEARCH_PARAM
+    search_description = 'Повнотекстовий пошук по назві, ключових словах та опису'
+    # Поля для простого пошуку по входженню, якщо СУБД не підтримується
+    fallback_fields = INDEXED_FIELDS
+
+    def filter_queryset(self, request, queryset, view):
+        stems = tokenize(request.query_params.get(self.search_param, ''))
+        if not stems:
+            return queryset
+
+        backend = get_backend()
+        if backend is None:
+            # Непідтримувана СУБД - простий пошук по входженню
+            condition = Q()
+            for term in request.query_params[self.search_param].split():
+                term_condition = Q()
+                for field in self.fallback_fields:
+                    term_condition |= Q(**{f'{field}__icontains': term})
+                condition &= term_condition
+            return queryset.filter(condition)
+
+        return self.rank(request, queryset, backend.build_query(stems))
+
+    def rank(self, request, queryset, query):
+        queryset = queryset.filter(search_entry__document__match=query).annotate(
+            search_rank=SearchRank('search_entry__document', Value(query))
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-created_at')
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': self.search_description,
+            'schema': {'type': 'string'},
+        }]
@@ -1,5 +1,10 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from .models import Content, ScientificField, Comment, Like
+from rest_framework.settings import api_settings
+from . import feed, search
+from .cache import response_cache
+from .models import Content, ScientificField, Comment, Like, allocate_slugs
+from .queries import comment_tree
 from users.serializers import UserShortSerializer
 
 
@@ -13,6 +18,10 @@ class ScientificFieldSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug']
 
     def get_contents_count(self, obj) -> int:
+        # Анотація з queryset (див. queries.scientific_fields_with_counts), інакше - окремий COUNT
+        contents_total = getattr(obj, 'contents_total', None)
+        if contents_total is not None:
+            return contents_total
         return obj.contents.count()
 
 
@@ -29,16 +38,13 @@ class ReplySerializer(serializers.ModelSerializer):
 class CommentSerializer(serializers.ModelSerializer):
     """Серіалізатор для коментарів"""
     author = UserShortSerializer(read_only=True)
-    replies = ReplySerializer(many=True, read_only=True)
-    replies_count = serializers.SerializerMethodField()
+    # Перші відповіді (див. queries.comment_tree), решта - GET .../comments/?parent={id}
+    replies = ReplySerializer(source='preview_replies', many=True, read_only=True)
 
     class Meta:
         model = Comment
         fields = ['id', 'author', 'text', 'created_at', 'replies', 'replies_count']
-        read_only_fields = ['id', 'author', 'created_at']
-
-    def get_replies_count(self, obj) -> int:
-        return obj.replies.count()
+        read_only_fields = ['id', 'author', 'created_at', 'replies_count']
 
 
 class CommentCreateSerializer(serializers.ModelSerializer):
@@ -68,8 +74,6 @@ class ContentListSerializer(serializers.ModelSerializer):
     """Серіалізатор для списку контенту (коротка версія)"""
     author = UserShortSerializer(read_only=True)
     scientific_fields = ScientificFieldSerializer(many=True, read_only=True)
-    comments_count = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Content
@@ -79,12 +83,7 @@ class ContentListSerializer(serializers.ModelSerializer):
             'views_count', 'likes_count', 'comments_count',
             'created_at'
         ]
-
-    def get_comments_count(self, obj) -> int:
-        return obj.comments.filter(parent__isnull=True).count()
-
-    def get_likes_count(self, obj) -> int:
-        return obj.likes.count()
+        read_only_fields = ['views_count', 'likes_count', 'comments_count']
 
 
 class ContentDetailSerializer(serializers.ModelSerializer):
@@ -92,8 +91,7 @@ class ContentDetailSerializer(serializers.ModelSerializer):
     author = UserShortSerializer(read_only=True)
     scientific_fields = ScientificFieldSerializer(many=True, read_only=True)
     comments = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
+    comments_next = serializers.SerializerMethodField()
     liked = serializers.SerializerMethodField()
 
     class Meta:
@@ -103,32 +101,101 @@ class ContentDetailSerializer(serializers.ModelSerializer):
             'scientific_fields', 'keywords', 'status',
             'is_public', 'is_open_for_collaboration',
             'views_count', 'likes_count', 'liked',
-            'comments', 'comments_count',
+            'comments', 'comments_next', 'comments_count',
             'created_at', 'updated_at'
         ]
+        read_only_fields = ['views_count', 'likes_count', 'comments_count']
 
     def get_comments(self, obj):
-        """Повертаємо тільки коментарі верхнього рівня (з відповідями)"""
-        top_level_comments = obj.comments.filter(parent__isnull=True)
-        return CommentSerializer(top_level_comments, many=True).data
-
-    def get_comments_count(self, obj) -> int:
-        return obj.comments.count()
-
-    def get_likes_count(self, obj) -> int:
-        return obj.likes.count()
+        """
+        Перша сторінка коментарів верхнього рівня (з першими відповідями).
+        View передає вже завантажену сторінку через context['comments'].
+        """
+        comments = self.context.get('comments')
+        if comments is None:
+            top_level_comments = obj.comments.filter(parent__isnull=True).order_by('created_at', 'pk')
+            comments = comment_tree(top_level_comments)[:api_settings.PAGE_SIZE]
+        return CommentSerializer(comments, many=True).data
+
+    def get_comments_next(self, obj) -> str | None:
+        """Посилання на наступну сторінку коментарів"""
+        return self.context.get('comments_next')
 
     def get_liked(self, obj) -> bool:
         """Перевіряємо чи поточний користувач лайкнув контент"""
+        # Анотація з queryset (див. ContentViewSet.with_viewer_liked), інакше - окремий запит
+        viewer_liked = getattr(obj, 'viewer_liked', None)
+        if viewer_liked is not None:
+            return viewer_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.likes.filter(user=request.user).exists()
         return False
 
 
+class ScientificFieldIdsField(serializers.PrimaryKeyRelatedField):
+    """
+    id галузі науки. Якщо view передав усі галузі в context['scientific_fields']
+    (словник id -> галузь), id перевіряються без запиту до БД на кожен
+    """
+
+    def to_internal_value(self, data):
+        scientific_fields = self.context.get('scientific_fields')
+        if scientific_fields is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return scientific_fields[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class ContentBulkCreateSerializer(serializers.ListSerializer):
+    """
+    Масове створення контенту (POST /api/contents/bulk/): slug усіх записів виділяються
+    одним запитом, контент і зв'язки з галузями вставляються bulk_create в одній транзакції.
+    bulk_create не надсилає сигналів, тому індекс пошуку, стрічки підписників
+    і кеш відповідей оновлюються тут (див. signals.py)
+    """
+
+    def create(self, validated_data):
+        author = self.context['request'].user
+        field_ids = [
+            {field.pk for field in item.pop('scientific_field_ids', [])} for item in validated_data
+        ]
+        contents = [Content(author=author, **item) for item in validated_data]
+        Through = Content.scientific_fields.through
+
+        for attempt in range(Content.SLUG_ATTEMPTS):
+            for content, slug in zip(contents, allocate_slugs(content.title for content in contents)):
+                content.pk = None
+                content.slug = slug
+            try:
+                with transaction.atomic():
+                    Content.objects.bulk_create(contents)
+                    Through.objects.bulk_create(
+                        Through(content_id=content.pk, scientificfield_id=field_id)
+                        for content, ids in zip(contents, field_ids) for field_id in ids
+                    )
+                    search.index_contents(contents)
+                    feed.fan_out_many(author, contents)
+                break
+            except IntegrityError:
+                # Slug зайняли паралельно - виділяємо заново; інша помилка або закінчились спроби - пробрасуємо
+                slugs = [content.slug for content in contents]
+                if attempt == Content.SLUG_ATTEMPTS - 1 or not Content.objects.filter(slug__in=slugs).exists():
+                    raise
+
+        response_cache.bump()
+        return contents
+
+
 class ContentCreateSerializer(serializers.ModelSerializer):
     """Серіалізатор для створення/оновлення контенту"""
-    scientific_field_ids = serializers.PrimaryKeyRelatedField(
+    scientific_field_ids = ScientificFieldIdsField(
         queryset=ScientificField.objects.all(),
         many=True,
         write_only=True,
@@ -143,6 +210,7 @@ class ContentCreateSerializer(serializers.ModelSerializer):
             'is_public', 'is_open_for_collaboration'
         ]
         read_only_fields = ['id', 'slug']
+        list_serializer_class = ContentBulkCreateSerializer
 
     def validate(self, data):
         """Валідація: для ресурсів/вебінарів/лекцій посилання обов'язкове"""
@@ -166,7 +234,11 @@ class ContentCreateSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         scientific_fields = validated_data.pop('scientific_field_ids', None)
-        instance = super().update(instance, validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Зберігаємо тільки змінені поля, щоб не перезаписати лічильники
+        # (лайки, коментарі, перегляди) застарілими значеннями
+        instance.save(update_fields=[*validated_data, 'updated_at'])
         if scientific_fields is not None:
             instance.scientific_fields.set(scientific_fields)
         return instance
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from . import feed, search
+from .cache import response_cache
+from .models import Content, Comment, Like, ScientificField
+
+
+@receiver(post_save, sender=Content)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Переіндексуємо контент, якщо змінились поля, що потрапляють в індекс"""
+    if update_fields is not None and not set(update_fields) & set(search.INDEXED_FIELDS):
+        return
+    search.index_content(instance)
+
+
+@receiver(post_save, sender=Content)
+def fan_out_to_feeds(sender, instance, created=False, **kwargs):
+    """Новий контент - у стрічки підписників (видимість перевіряється при читанні)"""
+    if created:
+        feed.fan_out(instance)
+
+
+@receiver(post_delete, sender=Content)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_content(instance.pk)
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=ScientificField)
+@receiver(post_delete, sender=ScientificField)
+@receiver(m2m_changed, sender=Content.scientific_fields.through)
+def invalidate_response_cache(sender, **kwargs):
+    """Будь-яка зміна контенту, лайків чи коментарів - нова версія кешу"""
+    response_cache.bump()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_response_cache_for_author(sender, update_fields=None, **kwargs):
+    """Автор вбудований у картки контенту; оновлення last_login не рахується"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    response_cache.bump()
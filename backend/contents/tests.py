@@ -0,0 +1,233 @@
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import resolve
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Comment, Content
+from .views import CommentViewSet
+
+User = get_user_model()
+
+
+@override_settings(FEED_FANOUT_MAX_FOLLOWERS=2, RESPONSE_CACHE_TIMEOUT=0)
+class FeedFanoutLimitTests(TestCase):
+    """Стрічка, коли автор перетинає межу fan-out (FEED_FANOUT_MAX_FOLLOWERS) в обидва боки"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.followers = [
+            User.objects.create_user(username=f'reader{index}', email=f'reader{index}@example.com', password='x')
+            for index in range(3)
+        ]
+
+    def client_for(self, user):
+        client = APIClient()
+        # Як у реальному запиті - користувач з БД, а не об'єкт з setUp з застарілими лічильниками
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        return client
+
+    def follow(self, user):
+        response = self.client_for(user).post(f'/api/users/{self.author.pk}/follow/', secure=True)
+        self.assertEqual(response.status_code, 200)
+
+    def post(self, title):
+        response = self.client_for(self.author).post(
+            '/api/contents/', {'title': title, 'description': 'опис'}, format='json', secure=True
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.data['slug']
+
+    def feed_slugs(self, user):
+        response = self.client_for(user).get('/api/contents/feed/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        return [item['slug'] for item in response.data['results']]
+
+    def test_posts_stay_in_feed_when_author_drops_below_limit(self):
+        for follower in self.followers:
+            self.follow(follower)
+        slug = self.post('Пост популярного автора')
+        for follower in self.followers:
+            self.assertEqual(self.feed_slugs(follower), [slug])
+
+        # 3 -> 2 підписники: автор знову в межі fan-out
+        self.follow(self.followers[0])
+        self.assertEqual(self.feed_slugs(self.followers[0]), [])
+        for follower in self.followers[1:]:
+            self.assertEqual(self.feed_slugs(follower), [slug])
+
+        # Новий пост після повернення до межі - через fan-out
+        newer = self.post('Пост після повернення')
+        for follower in self.followers[1:]:
+            self.assertEqual(self.feed_slugs(follower), [newer, slug])
+
+    def test_posts_stay_in_feed_when_author_becomes_popular(self):
+        self.follow(self.followers[0])
+        slug = self.post('Пост до популярності')
+        for follower in self.followers[1:]:
+            self.follow(follower)
+
+        self.assertEqual(Content.objects.get(slug=slug).author.followers_count, 3)
+        for follower in self.followers:
+            self.assertEqual(self.feed_slugs(follower), [slug])
+
+    def test_posts_stay_in_feed_when_follower_is_deleted(self):
+        for follower in self.followers:
+            self.follow(follower)
+        slug = self.post('Пост популярного автора')
+
+        self.followers[0].delete()
+
+        self.assertEqual(User.objects.get(pk=self.author.pk).followers_count, 2)
+        for follower in self.followers[1:]:
+            self.assertEqual(self.feed_slugs(follower), [slug])
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0, VIEW_COUNT_FLUSH_INTERVAL=0)
+class ConditionalGetTests(TestCase):
+    """Умовні GET не мають віддавати 304, коли змінились лише лічильники"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.reader = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+        self.content = Content.objects.create(title='Відкриття', description='опис', author=self.author)
+        self.url = f'/api/contents/{self.content.slug}/'
+
+    def test_like_invalidates_validators(self):
+        client = APIClient()
+        first = client.get(self.url, secure=True)
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('Last-Modified', first)
+        self.assertEqual(client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'], secure=True).status_code, 304)
+
+        liker = APIClient()
+        liker.force_authenticate(self.reader)
+        self.assertEqual(liker.post(f'{self.url}like/', secure=True).status_code, 200)
+
+        self.assertEqual(client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'], secure=True).status_code, 200)
+        self.assertEqual(
+            client.get(self.url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT', secure=True).status_code,
+            200
+        )
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class CommentDeleteTests(TestCase):
+    """Лічильники після видалення коментаря зменшуються рівно на видалене"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.content = Content.objects.create(title='Відкриття', description='опис', author=self.author)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def comment(self, parent=None):
+        data = {'text': 'коментар'}
+        if parent is not None:
+            data['parent_id'] = parent
+        response = self.client.post(f'/api/contents/{self.content.slug}/comments/', data, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_counters_after_delete(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        self.comment(parent=root)
+
+        self.assertEqual(self.client.delete(f'/api/contents/comments/{reply}/', secure=True).status_code, 204)
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.comments_count, 2)
+        self.assertEqual(Comment.objects.get(pk=root).replies_count, 1)
+
+        self.assertEqual(self.client.delete(f'/api/contents/comments/{root}/', secure=True).status_code, 204)
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.comments_count, 0)
+
+    def test_repeated_delete_does_not_decrement_again(self):
+        root = self.comment()
+        reply = self.comment(parent=root)
+        instance = Comment.objects.get(pk=reply)
+        Comment.objects.filter(pk=reply).delete()
+
+        CommentViewSet().perform_destroy(instance)
+
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.comments_count, 2)
+        self.assertEqual(Comment.objects.get(pk=root).replies_count, 1)
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0, VIEW_COUNT_FLUSH_INTERVAL=0)
+class AsyncReadViewTests(TestCase):
+    """Під ASGI (AsyncClient) GET контенту і коментарів - async view з тими самими відповідями"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.reader = User.objects.create_user(username='reader', email='reader@example.com', password='x')
+        # ASCII-slug: AsyncClient декодує шлях як ISO-8859-1 (як WSGI), тож кирилиця в URL не знаходиться
+        self.content = Content.objects.create(title='Discovery', description='опис', author=self.author)
+        self.url = f'/api/contents/{self.content.slug}/'
+
+        client = APIClient()
+        client.force_authenticate(self.reader)
+        client.post(f'{self.url}like/', secure=True)
+        self.root = client.post(f'{self.url}comments/', {'text': 'коментар'}, format='json', secure=True).data['id']
+        client.post(f'{self.url}comments/', {'text': 'відповідь', 'parent_id': self.root}, format='json', secure=True)
+
+    def headers(self, user):
+        return {'Authorization': f'Bearer {AccessToken.for_user(user)}'} if user else {}
+
+    def sync_get(self, url, user=None):
+        return APIClient().get(url, secure=True, headers=self.headers(user))
+
+    def async_get(self, url, user=None, headers=None):
+        return async_to_sync(AsyncClient().get)(url, secure=True, headers={**self.headers(user), **(headers or {})})
+
+    def test_routes_resolve_to_async_views(self):
+        for url in ('/api/contents/', self.url, f'{self.url}comments/', f'/api/users/{self.author.pk}/overview/'):
+            self.assertTrue(iscoroutinefunction(resolve(url, 'scientific_discoveries.asgi_urls').func), url)
+            self.assertFalse(iscoroutinefunction(resolve(url).func), url)
+
+    def test_responses_match_sync_views(self):
+        urls = ('/api/contents/', f'{self.url}comments/', f'{self.url}comments/?parent={self.root}', self.url)
+        for user in (None, self.reader):
+            for url in urls:
+                expected, response = self.sync_get(url, user), self.async_get(url, user)
+                self.assertEqual(response.status_code, 200, url)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'), url)
+                data, expected_data = response.json(), expected.json()
+                if url == self.url:
+                    # Кожен перегляд деталей рахується
+                    self.assertEqual(data.pop('views_count'), expected_data.pop('views_count') + 1)
+                    self.assertEqual(data['liked'], user is not None)
+                self.assertEqual(data, expected_data, url)
+
+    def test_not_modified_and_errors(self):
+        etag = self.async_get(self.url)['ETag']
+        self.assertEqual(self.async_get(self.url, headers={'If-None-Match': etag}).status_code, 304)
+
+        for url, status_code in (
+            ('/api/contents/missing/', 404),
+            ('/api/contents/?cursor=invalid', 404),
+            (f'{self.url}comments/?parent=x', 400),
+        ):
+            expected, response = self.sync_get(url), self.async_get(url)
+            self.assertEqual(response.status_code, status_code, url)
+            self.assertEqual(response.json(), expected.json(), url)
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=60)
+    def test_anonymous_responses_are_cached(self):
+        cache.clear()
+        self.assertEqual(self.async_get(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.async_get(self.url)['X-Cache'], 'HIT')
+        self.assertEqual(self.sync_get(self.url)['X-Cache'], 'HIT')
+        # Перегляди з кешу теж рахуються
+        self.content.refresh_from_db()
+        self.assertEqual(self.content.views_count, 3)
+
+    def test_writes_use_sync_views(self):
+        post = async_to_sync(AsyncClient().post)
+        response = post(f'{self.url}like/', secure=True, headers=self.headers(self.author))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['likes_count'], 2)
@@ -0,0 +1,115 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Case, F, Value, When
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    Буфер переглядів контенту (write-behind).
+
+    Інкременти накопичуються в пам'яті процесу, а фоновий потік раз на
+    VIEW_COUNT_FLUSH_INTERVAL секунд застосовує їх до БД одним UPDATE
+    з F()-виразом. Читання контенту більше не пише в БД і не блокує рядок.
+    """
+
+    # Скільки id оновлювати одним UPDATE (обмеження кількості параметрів SQL)
+    flush_batch_size = 500
+
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def interval(self):
+        return getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', 10)
+
+    def incr(self, content_id):
+        """
+        Додає перегляд. Повертає кількість переглядів, які ще не потрапили
+        в прочитане з БД значення (разом з поточним)
+        """
+        with self._lock:
+            self._pending[content_id] += 1
+            pending = self._pending[content_id]
+
+        if self.interval <= 0:
+            # Буферизацію вимкнено - пишемо одразу. Помилка БД не повинна ламати
+            # читання контенту: інкремент лишається в буфері до наступного скидання
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception('Не вдалося зберегти лічильники переглядів')
+        else:
+            self._ensure_thread()
+        return pending
+
+    async def aincr(self, content_id):
+        """incr для async view: у потоці лише тоді, коли запис іде в БД одразу"""
+        if self.interval <= 0:
+            return await sync_to_async(self.incr)(content_id)
+        return self.incr(content_id)
+
+    def flush(self):
+        """Записує накопичені перегляди в БД. Повертає кількість оновлених записів"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+
+        from .models import Content
+
+        items = list(pending.items())
+        for start in range(0, len(items), self.flush_batch_size):
+            batch = items[start:start + self.flush_batch_size]
+            try:
+                Content.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                    views_count=F('views_count') + Case(
+                        *[When(pk=pk, then=Value(count)) for pk, count in batch],
+                        default=Value(0)
+                    )
+                )
+            except DatabaseError:
+                # Повертаємо в буфер незаписані інкременти (з цього пакета й далі),
+                # щоб не загубити їх; вже записані пакети повторно не рахуються
+                with self._lock:
+                    self._pending.update(dict(items[start:]))
+                raise
+        return len(items)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='view-count-flush', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Не вдалося зберегти лічильники переглядів')
+            finally:
+                # Потік має власні з'єднання з БД - не тримаємо їх між скиданнями
+                connections.close_all()
+
+
+view_counter = ViewCountBuffer()
+
+# Зберігаємо залишок буфера при завершенні процесу
+atexit.register(view_counter.flush)
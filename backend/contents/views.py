@@ -1,17 +1,31 @@
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from rest_framework.reverse import reverse
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, F, Exists, OuterRef
+
+from scientific_discoveries.async_views import AsyncReadMixin
+from scientific_discoveries.conditional import ConditionalGetMixin
+from scientific_discoveries.db_router import ReplicaReadMixin
+from scientific_discoveries.pagination import EmbeddedFirstPagePagination, KeysetPagination
 
 from .models import Content, ScientificField, Comment, Like
+from .search import FullTextSearchFilter
+from .feed import feed_queryset
+from .queries import scientific_fields_with_counts, with_list_relations, comment_tree, author_contents
+from .view_counter import view_counter
+from .cache import response_cache
 from .serializers import (
     ContentListSerializer,
     ContentDetailSerializer,
     ContentCreateSerializer,
     ScientificFieldSerializer,
     CommentSerializer,
-    CommentCreateSerializer
+    CommentCreateSerializer,
+    ReplySerializer
 )
 
 
@@ -33,38 +47,49 @@ class ScientificFieldViewSet(viewsets.ReadOnlyModelViewSet):
     GET /api/contents/fields/ - список галузей
     GET /api/contents/fields/{slug}/ - деталі галузі
     """
-    queryset = ScientificField.objects.all()
+    queryset = scientific_fields_with_counts()
     serializer_class = ScientificFieldSerializer
     lookup_field = 'slug'  # Використовуємо slug замість id
 
 
-class ContentViewSet(viewsets.ModelViewSet):
+class ContentViewSet(ReplicaReadMixin, ConditionalGetMixin, AsyncReadMixin, viewsets.ModelViewSet):
     """
     ViewSet для контенту (ідеї, ресурси, вебінари, лекції)
 
     GET /api/contents/ - список (з фільтрацією по content_type: idea/resource/webinar/lecture)
+    GET /api/contents/feed/ - стрічка від тих, на кого я підписаний
     POST /api/contents/ - створити
+    POST /api/contents/bulk/ - створити багато (масив)
     GET /api/contents/{slug}/ - деталі
     PATCH /api/contents/{slug}/ - оновити
     DELETE /api/contents/{slug}/ - видалити
     POST /api/contents/{slug}/like/ - лайкнути/анлайкнути
     POST /api/contents/{slug}/comments/ - додати коментар
+
+    Під ASGI GET списку, деталей і коментарів - async view (див. async_views.py)
     """
     queryset = Content.objects.filter(is_public=True)
     lookup_field = 'slug'
+    pagination_class = KeysetPagination
 
     # Фільтрація та пошук
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # Пошук - останнім: без явного ordering сортує за релевантністю
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'author', 'is_open_for_collaboration', 'content_type']
-    search_fields = ['title', 'description', 'keywords']
     ordering_fields = ['created_at', 'views_count']
     ordering = ['-created_at']  # За замовчуванням - нові спочатку
+    async_actions = {'list': 'alist', 'retrieve': 'aretrieve', 'comments': 'acomments'}
 
     def get_permissions(self):
         """Різні права для різних дій"""
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
-        elif self.action in ['create', 'like', 'comments']:
+        elif self.action == 'cache_stats':
+            return [permissions.IsAdminUser()]
+        elif self.action == 'comments' and self.request.method in permissions.SAFE_METHODS:
+            # Читати коментарі (наступні сторінки після вбудованої) можуть всі
+            return [permissions.AllowAny()]
+        elif self.action in ['create', 'bulk', 'like', 'comments']:
             # Створення контенту, лайки та коментарі - тільки авторизовані
             return [permissions.IsAuthenticated()]
         else:
@@ -77,13 +102,27 @@ class ContentViewSet(viewsets.ModelViewSet):
             return ContentListSerializer
         elif self.action == 'retrieve':
             return ContentDetailSerializer
-        elif self.action in ['create', 'update', 'partial_update']:
+        elif self.action in ['create', 'bulk', 'update', 'partial_update']:
             return ContentCreateSerializer
         elif self.action == 'add_comment':
             return CommentCreateSerializer
         return ContentListSerializer
 
     def get_queryset(self):
+        queryset = with_list_relations(self.get_visible_queryset())
+        if self.action == 'retrieve':
+            queryset = self.with_viewer_liked(queryset)
+        return queryset
+
+    def with_viewer_liked(self, queryset):
+        """Анотація viewer_liked - чи лайкнув контент поточний користувач"""
+        if self.request.user.is_authenticated:
+            queryset = queryset.annotate(viewer_liked=Exists(
+                Like.objects.filter(content=OuterRef('pk'), user=self.request.user)
+            ))
+        return queryset
+
+    def get_visible_queryset(self):
         """Фільтруємо контент"""
         queryset = Content.objects.filter(is_public=True)
 
@@ -98,80 +137,264 @@ class ContentViewSet(viewsets.ModelViewSet):
         if field_slug:
             queryset = queryset.filter(scientific_fields__slug=field_slug)
 
-        return queryset.select_related('author').prefetch_related('scientific_fields').distinct()
+        return queryset.distinct()
+
+    # Максимум записів в одному POST /api/contents/bulk/
+    bulk_max_items = 1000
+
+    # Від чого залежить представлення контенту (для ETag)
+    validator_fields = ('pk', 'updated_at', 'likes_count', 'comments_count', 'author__updated_at')
+
+    def get_validator_fields(self):
+        if self.request.user.is_authenticated:
+            return self.validator_fields + ('viewer_liked',)
+        return self.validator_fields
+
+    def get_validator_queryset(self):
+        return self.with_viewer_liked(self.get_visible_queryset())
+
+    def get_cached_response(self, request, build, *args, **kwargs):
+        """
+        Анонімні GET віддаються з кешу відповідей (див. cache.ResponseCache).
+        Персональних полів у таких відповідях немає: liked для анонімів завжди False,
+        а приватний контент анонімам не видно.
+        """
+        if request.user.is_authenticated:
+            return build(request, *args, **kwargs)
+
+        key = response_cache.make_key(self.action, request, **kwargs)
+        data = response_cache.get(key)
+        if data is not None:
+            return self.cache_hit_response(data)
+
+        response = build(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def aget_cached_response(self, request, build, *args, **kwargs):
+        """get_cached_response для async view: build повертає корутину"""
+        if request.user.is_authenticated:
+            return await build(request, *args, **kwargs)
+
+        key = await response_cache.amake_key(self.action, request, **kwargs)
+        data = await response_cache.aget(key)
+        if data is not None:
+            return self.cache_hit_response(data)
+
+        response = await build(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            await response_cache.aset(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def cache_hit_response(self, data):
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        build_list = super().list
+        return self.conditional_response(
+            request, lambda: self.get_cached_response(request, build_list, *args, **kwargs)
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        build_list = super().alist
+        return await self.aconditional_response(
+            request, lambda: self.aget_cached_response(request, build_list, *args, **kwargs)
+        )
 
     def retrieve(self, request, *args, **kwargs):
-        """При перегляді - збільшуємо лічильник переглядів"""
+        response = self.conditional_response(
+            request, lambda: self.get_cached_response(request, self.build_detail_response, *args, **kwargs)
+        )
+        if self.served_without_build(response):
+            view_counter.incr(self.validator_rows[0][0])
+        return response
+
+    async def aretrieve(self, request, *args, **kwargs):
+        response = await self.aconditional_response(
+            request, lambda: self.aget_cached_response(request, self.abuild_detail_response, *args, **kwargs)
+        )
+        if self.served_without_build(response):
+            await view_counter.aincr(self.validator_rows[0][0])
+        return response
+
+    def served_without_build(self, response):
+        """Відповідь з кешу або 304: перегляд рахуємо і для неї"""
+        return response.status_code == status.HTTP_304_NOT_MODIFIED or response.get('X-Cache') == 'HIT'
+
+    def build_detail_response(self, request, *args, **kwargs):
+        """
+        При перегляді - збільшуємо лічильник переглядів.
+        Інкремент іде в буфер (див. view_counter), у відповіді - значення з БД
+        плюс ще не збережені перегляди.
+        Вбудовуємо тільки першу сторінку коментарів.
+        """
         instance = self.get_object()
-        instance.views_count += 1
-        instance.save(update_fields=['views_count'])
-        serializer = self.get_serializer(instance)
+        instance.views_count += view_counter.incr(instance.pk)
+
+        paginator = self.get_comments_paginator(request, instance)
+        comments = paginator.paginate_queryset(self.get_comments_queryset(instance), request, view=self)
+        return self.detail_response(instance, comments, paginator)
+
+    async def abuild_detail_response(self, request, *args, **kwargs):
+        """build_detail_response для async view"""
+        instance = await self.aget_object()
+        instance.views_count += await view_counter.aincr(instance.pk)
+
+        paginator = self.get_comments_paginator(request, instance)
+        comments = await paginator.apaginate_queryset(self.get_comments_queryset(instance), request, view=self)
+        return self.detail_response(instance, comments, paginator)
+
+    def get_comments_paginator(self, request, content):
+        """Пагінатор вбудованої першої сторінки коментарів (next - на endpoint коментарів)"""
+        paginator = EmbeddedFirstPagePagination()
+        paginator.base_url = request.build_absolute_uri(
+            reverse('content-comments', kwargs={'slug': content.slug})
+        )
+        return paginator
+
+    def detail_response(self, instance, comments, paginator):
+        serializer = self.get_serializer(instance, context={
+            **self.get_serializer_context(),
+            'comments': comments,
+            'comments_next': paginator.get_next_link(),
+        })
         return Response(serializer.data)
 
+    def get_comments_queryset(self, content):
+        """Коментарі верхнього рівня з авторами і першими відповідями"""
+        return comment_tree(
+            content.comments.filter(parent__isnull=True).order_by('created_at', 'pk')
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        POST /api/contents/bulk/ - створити до bulk_max_items записів одним запитом
+        (масив об'єктів, як для POST /api/contents/). Все або нічого: якщо хоч один
+        запис невалідний - 400 зі списком помилок у порядку записів ({} для коректних)
+        """
+        serializer = self.get_serializer(
+            data=request.data, many=True, allow_empty=False, max_length=self.bulk_max_items,
+            # Галузі - одним запитом замість запиту на кожен id
+            context={**self.get_serializer_context(), 'scientific_fields': ScientificField.objects.in_bulk()},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @action(detail=True, methods=['post'])
     def like(self, request, slug=None):
         """
         POST /api/contents/{slug}/like/ - лайкнути/анлайкнути контент (toggle)
         """
         content = self.get_object()
-        like, created = Like.objects.get_or_create(content=content, user=request.user)
 
-        if not created:
-            # Лайк вже існує - видаляємо (анлайк)
-            like.delete()
-            return Response({
-                'status': 'unliked',
-                'likes_count': content.likes.count()
-            })
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(content=content, user=request.user)
+            if created:
+                delta = 1
+            else:
+                # Лайк вже існує - видаляємо (анлайк).
+                # Рахуємо реально видалені рядки: паралельний анлайк міг нас випередити
+                delta = -Like.objects.filter(pk=like.pk).delete()[0]
+            if delta:
+                Content.objects.filter(pk=content.pk).update(
+                    likes_count=F('likes_count') + delta
+                )
 
+        content.refresh_from_db(fields=['likes_count'])
         return Response({
-            'status': 'liked',
-            'likes_count': content.likes.count()
+            'status': 'liked' if created else 'unliked',
+            'likes_count': content.likes_count
         })
 
     @action(detail=True, methods=['get', 'post'], url_path='comments')
     def comments(self, request, slug=None):
         """
-        GET /api/contents/{slug}/comments/ - список коментарів
+        GET /api/contents/{slug}/comments/ - список коментарів (з пагінацією)
+        GET /api/contents/{slug}/comments/?parent={id} - відповіді на коментар
         POST /api/contents/{slug}/comments/ - додати коментар
         """
         content = self.get_object()
 
         if request.method == 'GET':
-            # Повертаємо тільки коментарі верхнього рівня
-            comments = content.comments.filter(parent__isnull=True)
-            serializer = CommentSerializer(comments, many=True)
-            return Response(serializer.data)
+            queryset, serializer_class = self.get_comments_list(request, content)
+            page = self.paginate_queryset(queryset)
+            return self.get_paginated_response(serializer_class(page, many=True).data)
 
         elif request.method == 'POST':
             serializer = CommentCreateSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            serializer.save(content=content, author=request.user)
+
+            with transaction.atomic():
+                comment = serializer.save(content=content, author=request.user)
+                Content.objects.filter(pk=content.pk).update(
+                    comments_count=F('comments_count') + 1
+                )
+                if comment.parent_id:
+                    Comment.objects.filter(pk=comment.parent_id).update(
+                        replies_count=F('replies_count') + 1
+                    )
 
             # Повертаємо повний коментар
-            comment = Comment.objects.get(pk=serializer.instance.pk)
+            comment = comment_tree(Comment.objects.all()).get(pk=comment.pk)
             return Response(
                 CommentSerializer(comment).data,
                 status=status.HTTP_201_CREATED
             )
 
+    async def acomments(self, request, slug=None):
+        """GET comments для async view"""
+        content = await self.aget_object()
+        queryset, serializer_class = self.get_comments_list(request, content)
+        page = await self.apaginate_queryset(queryset)
+        return self.get_paginated_response(serializer_class(page, many=True).data)
+
+    def get_comments_list(self, request, content):
+        """Queryset і серіалізатор сторінки для GET comments"""
+        parent_id = request.query_params.get('parent')
+        if parent_id:
+            # Відповіді на конкретний коментар
+            if not parent_id.isdigit():
+                raise ValidationError({'parent': 'Невірний id коментаря'})
+            replies = content.comments.filter(parent_id=parent_id).select_related('author')
+            return replies.order_by('created_at', 'pk'), ReplySerializer
+
+        # Коментарі верхнього рівня (сторінками за created_at, id)
+        return self.get_comments_queryset(content), CommentSerializer
+
+    @action(detail=False, methods=['get'], url_path='cache-stats')
+    def cache_stats(self, request):
+        """
+        GET /api/contents/cache-stats/ - статистика кешу відповідей (тільки адміни)
+        """
+        return Response(response_cache.stats())
+
     @action(detail=False, methods=['get'])
     def my(self, request):
         """
-        GET /api/contents/my/ - мій контент (з опціональною фільтрацією по content_type)
+        GET /api/contents/my/ - мій контент (з пагінацією та опціональною
+        фільтрацією по content_type / status)
         """
-        contents = Content.objects.filter(author=request.user)
-
-        # Опціональна фільтрація по типу контенту
-        content_type = request.query_params.get('content_type')
-        if content_type:
-            contents = contents.filter(content_type=content_type)
+        page = self.paginate_queryset(author_contents(request.user, request.query_params))
+        serializer = ContentListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
-        serializer = ContentListSerializer(contents, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'])
+    def feed(self, request):
+        """GET /api/contents/feed/ - публічний контент від тих, на кого я підписаний"""
+        contents = with_list_relations(feed_queryset(request.user).order_by('-created_at', '-pk'))
+        page = self.paginate_queryset(contents)
+        serializer = ContentListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet для коментарів (видалення)
 
@@ -181,3 +404,24 @@ class CommentViewSet(viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrReadOnly]
     http_method_names = ['delete']  # Тільки видалення
+
+    def perform_destroy(self, instance):
+        """
+        Видаляємо коментар (разом з відповідями) і зменшуємо лічильники на те,
+        що справді видалено: паралельне видалення того самого коментаря
+        лічильники вдруге не зменшує
+        """
+        with transaction.atomic():
+            # Рядок блокується до кінця транзакції: якщо він є, видаляємо його саме ми
+            if not Comment.objects.select_for_update().filter(pk=instance.pk).exists():
+                return
+            _, deleted = instance.delete()
+            removed = deleted.get(Comment._meta.label, 0)
+            Content.objects.filter(pk=instance.content_id).update(
+                comments_count=F('comments_count') - removed
+            )
+            if instance.parent_id:
+                # Серед видаленого пряма відповідь батька - лише сам коментар
+                Comment.objects.filter(pk=instance.parent_id).update(
+                    replies_count=F('replies_count') - 1
+                )
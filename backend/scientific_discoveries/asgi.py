@@ -0,0 +1,38 @@
+"""
+ASGI config for scientific_discoveries project.
+
+Запуск: gunicorn scientific_discoveries.asgi -k uvicorn.workers.UvicornWorker
+
+Гарячі маршрути читання (список і деталі контенту, коментарі, профіль
+користувача) - async view на async ORM (див. async_views.py, asgi_urls.py):
+між запитами до БД і кешу запит не займає потік. Решта view синхронні:
+Django виконує їх у потоці запиту (ThreadSensitiveContext), тому повільний
+запит не займає весь воркер. Одночасних запитів на процес - не більше
+ASGI_MAX_CONCURRENCY: кожен тримає власне з'єднання з БД.
+"""
+import asyncio
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'scientific_discoveries.settings')
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+
+class ConcurrencyLimit:
+    """ASGI-обгортка: HTTP-запити понад limit чекають, поки звільниться місце (limit 0 - без обмеження)"""
+
+    def __init__(self, app, limit):
+        self.app = app
+        self.semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if self.semaphore is None or scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        async with self.semaphore:
+            return await self.app(scope, receive, send)
+
+
+application = ConcurrencyLimit(django_application, getattr(settings, 'ASGI_MAX_CONCURRENCY', 32))
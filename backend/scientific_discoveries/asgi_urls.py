@@ -0,0 +1,8 @@
+"""
+URL-и для запитів через ASGI: маршрути urls.py з асинхронними view читання
+(див. async_views.py і middleware.AsyncUrlconfMiddleware)
+"""
+from .async_views import async_urlpatterns
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = async_urlpatterns(sync_urlpatterns)
@@ -0,0 +1,132 @@
+"""
+Асинхронні view читання для ASGI-розгортання.
+
+Під ASGI запити маршрутизуються за asgi_urls.py (див. middleware.AsyncUrlconfMiddleware):
+ті самі маршрути, але для ViewSet-ів з AsyncReadMixin GET/HEAD дій з async_actions
+виконуються корутинами на async ORM і не займають потік на весь запит.
+Решта методів і дій - звичайний синхронний view DRF у потоці, як і раніше.
+
+Синхронний код DRF без async-версій (автентифікація, права, throttling, фільтри)
+виконується через sync_to_async. Серіалізація йде в event loop, тому queryset-и
+async-дій мають завантажувати все потрібне серіалізатору заздалегідь
+(select_related / prefetch_related / анотації). Під WSGI нічого не змінюється.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.urls import URLPattern, URLResolver
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+
+class AsyncReadMixin:
+    """
+    Асинхронні версії дій читання ViewSet-а (разом з GenericViewSet).
+    async_actions: дія -> ім'я корутини, що обробляє її GET/HEAD
+    """
+    async_actions = {'list': 'alist', 'retrieve': 'aretrieve'}
+
+    @classmethod
+    def as_async_view(cls, view):
+        """Async view для маршруту роутера; view - синхронний view того ж маршруту (as_view)"""
+        actions, initkwargs = view.actions, view.initkwargs
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            action = actions.get('get')
+            if request.method not in ('GET', 'HEAD') or action not in cls.async_actions:
+                return await sync_view(request, *args, **kwargs)
+
+            # Те саме, що view() з ViewSetMixin.as_view
+            self = cls(**initkwargs)
+            actions.setdefault('head', action)
+            self.action_map = actions
+            for method, name in actions.items():
+                setattr(self, method, getattr(self, name))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        async_view.cls = cls
+        async_view.initkwargs = initkwargs
+        async_view.actions = actions
+        # CSRF для сесій перевіряє DRF, як і в синхронному view
+        return csrf_exempt(async_view)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch для дій з async_actions"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, self.async_actions[self.action])
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def afilter_queryset(self, queryset):
+        # Фільтри можуть читати БД (перевірка значень ModelChoiceFilter)
+        return await sync_to_async(self.filter_queryset)(queryset)
+
+    async def aget_object(self):
+        """GenericAPIView.get_object на async ORM"""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        apaginate = getattr(self.paginator, 'apaginate_queryset', None)
+        if apaginate is None:
+            return await sync_to_async(self.paginator.paginate_queryset)(queryset, self.request, view=self)
+        return await apaginate(queryset, self.request, view=self)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        serializer = self.get_serializer(await self.aget_object())
+        return Response(serializer.data)
+
+
+def async_urlpatterns(patterns):
+    """
+    Копія urlpatterns, де view ViewSet-ів з AsyncReadMixin замінені на async view
+    (ті самі шаблони, імена та простори імен - reverse() працює однаково)
+    """
+    converted = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            pattern = URLResolver(
+                pattern.pattern, async_urlpatterns(pattern.url_patterns), pattern.default_kwargs,
+                pattern.app_name, pattern.namespace,
+            )
+        elif getattr(pattern.callback, 'actions', None) is not None and issubclass(
+            pattern.callback.cls, AsyncReadMixin
+        ):
+            pattern = URLPattern(
+                pattern.pattern, pattern.callback.cls.as_async_view(pattern.callback),
+                pattern.default_args, pattern.name,
+            )
+        converted.append(pattern)
+    return converted
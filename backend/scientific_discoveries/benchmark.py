@@ -0,0 +1,282 @@
+"""
+Бенчмарк API у процесі (без HTTP-сервера).
+
+Маршрути знаходяться автоматично в contents/urls.py і users/urls.py,
+тому нова дія ViewSet потрапляє в бенчмарк без змін тут. Для кожного
+GET-маршруту вимірюються затримка (p50/p95/p99), кількість запитів до БД
+і кількість прочитаних з БД рядків. Змінюючі запити (POST/PATCH/DELETE)
+не виконуються - вони змінювали б дані між ітераціями.
+
+Використовується командою run_benchmark на даних з seed_benchmark.
+З asgi=True запити йдуть через ASGI-обробник Django, тобто в async view
+(див. async_views.py), як під uvicorn.
+"""
+import logging
+import math
+import re
+import statistics
+import subprocess
+import time
+from collections import namedtuple
+from urllib.parse import unquote
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import URLResolver, get_resolver
+
+ROUTE_MODULES = ('contents.urls', 'users.urls')
+
+# Додаткові варіанти запитів (пошук, фільтри, сортування) для окремих маршрутів
+QUERY_VARIANTS = {
+    'content-list': (
+        {},
+        {'search': 'квантові обчислення'},
+        {'content_type': 'webinar'},
+        {'ordering': '-views_count'},
+    ),
+    'user-list': ({}, {'search': 'Шевченко'}),
+    'user-autocomplete': ({'search': 'Кова'},),
+}
+
+Route = namedtuple('Route', ['name', 'template'])
+Result = namedtuple('Result', [
+    'route', 'name', 'auth', 'params', 'status', 'timings', 'queries', 'rows', 'size', 'statements',
+])
+
+_GROUP = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+_CONVERTER = re.compile(r'<(?:\w+:)?(\w+)>')
+
+
+def _template(pattern):
+    """Шаблон шляху з '{slug}' замість груп регулярного виразу / конвертерів"""
+    text = _CONVERTER.sub(r'{\1}', _GROUP.sub(r'{\1}', str(pattern)))
+    return text.lstrip('^').rstrip('$')
+
+
+def _allows_get(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return 'get' in actions
+    view_class = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None)
+    return view_class is not None and hasattr(view_class, 'get')
+
+
+def discover_routes(modules=ROUTE_MODULES):
+    """
+    GET-маршрути з модулів urls (без варіантів із суфіксом формату .json).
+    Маршрут, перекритий попереднім з тим самим шаблоном (api-root роутера), пропускається
+    """
+    routes = {}
+
+    def walk(patterns, prefix, included):
+        for pattern in patterns:
+            template = prefix + _template(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                name = getattr(pattern.urlconf_name, '__name__', pattern.urlconf_name)
+                walk(pattern.url_patterns, template, included or name in modules)
+            elif (
+                included
+                and 'format' not in pattern.pattern.regex.groupindex
+                and _allows_get(pattern.callback)
+            ):
+                routes.setdefault('/' + template, Route(pattern.name, '/' + template))
+
+    walk(get_resolver().url_patterns, '', False)
+    return list(routes.values())
+
+
+def sample_kwargs():
+    """
+    Значення параметрів шляху за basename маршруту: найпопулярніші об'єкти,
+    щоб вимірювати найважчі сторінки (багато коментарів, підписників)
+    """
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+
+    from contents.models import Content, ScientificField
+
+    User = get_user_model()
+    samples = {}
+    content = Content.objects.filter(is_public=True).order_by('-comments_count', '-likes_count').first()
+    if content:
+        samples['content'] = {'slug': content.slug}
+    user = User.objects.filter(is_active=True, is_staff=False).order_by('-followers_count').first()
+    if user:
+        samples['user'] = {'pk': user.pk}
+    field = ScientificField.objects.annotate(total=Count('contents')).order_by('-total').first()
+    if field:
+        samples['field'] = {'slug': field.slug}
+    return samples
+
+
+def benchmark_viewer():
+    """
+    Авторизований користувач для запитів: автор з найбільшою кількістю підписок
+    (важка стрічка і непорожній "мій контент")
+    """
+    from django.contrib.auth import get_user_model
+
+    return get_user_model().objects.filter(
+        is_active=True, is_staff=False, contents__isnull=False
+    ).distinct().order_by('-following_count', 'pk').first()
+
+
+class QueryStats:
+    """
+    Рахує запити до БД і прочитані рядки (через connection.execute_wrapper):
+    методи fetch* курсора підміняються на обгортки, що рахують повернені рядки.
+    SQL останнього запиту зберігається в statements (для діагностики N+1)
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.queries = 0
+        self.rows = 0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        self.statements.append(sql)
+        cursor = context['cursor']
+        if not getattr(cursor, '_benchmark_counted', False):
+            cursor._benchmark_counted = True
+            cursor.fetchone = self._count(cursor.fetchone, lambda row: row is not None)
+            cursor.fetchmany = self._count(cursor.fetchmany, len)
+            cursor.fetchall = self._count(cursor.fetchall, len)
+        return execute(sql, params, many, context)
+
+    def _count(self, fetch, rows_in):
+        def counted(*args, **kwargs):
+            result = fetch(*args, **kwargs)
+            self.rows += int(rows_in(result))
+            return result
+        return counted
+
+
+class ASGIClient(AsyncClient):
+    """AsyncClient з синхронним get - той самий інтерфейс, що й у Client"""
+
+    def _get_path(self, parsed):
+        # Як від ASGI-сервера: шлях у UTF-8 (AsyncClient декодує його як ISO-8859-1, за WSGI)
+        return unquote(parsed.path)
+
+    def get(self, *args, **kwargs):
+        return async_to_sync(super().get)(*args, **kwargs)
+
+
+def percentile(values, p):
+    """Перцентиль методом найближчого рангу"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def run(
+    routes, samples, token=None, iterations=20, warmup=2, variants=QUERY_VARIANTS, common_params=None,
+    asgi=False,
+):
+    """
+    Виконує кожен маршрут анонімно і з токеном (token), повертає список Result.
+    asgi - через ASGI-обробник (async view) замість WSGI.
+    common_params додаються до query-параметрів кожного запиту (наприклад, page_size).
+    Варіанти, що відповідають 401/403/405, пропускаються (маршрут потребує іншої
+    ролі або GET для нього вимкнено).
+    Анонімні відповіді після прогріву віддаються з кешу - як і в робочому режимі
+    """
+    auths = [('anonymous', {})]
+    if token:
+        auths.append(('user', {'Authorization': f'Bearer {token}'}))
+
+    stats = QueryStats()
+    # Очікувані 401/403/405 не повинні засмічувати вивід попередженнями django.request
+    request_logger = logging.getLogger('django.request')
+    level = request_logger.level
+    request_logger.setLevel(logging.ERROR)
+    try:
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']), \
+                connection.execute_wrapper(stats):
+            return _run_routes(
+                ASGIClient() if asgi else Client(), stats, routes, samples, auths, iterations, warmup, variants,
+                common_params,
+            )
+    finally:
+        request_logger.setLevel(level)
+
+
+def _run_routes(client, stats, routes, samples, auths, iterations, warmup, variants, common_params):
+    results = []
+    for route in routes:
+        basename = route.name.rsplit('-', 1)[0] if route.name else ''
+        kwargs = samples.get(basename, {})
+        try:
+            path = route.template.format(**kwargs)
+        except KeyError:
+            continue  # Немає даних для параметрів шляху
+        for params in variants.get(route.name, ({},)):
+            for auth, headers in auths:
+                result = _measure(
+                    client, stats, route, path, params, {**params, **(common_params or {})},
+                    auth, headers, iterations, warmup,
+                )
+                if result is not None:
+                    results.append(result)
+    return results
+
+
+def _measure(client, stats, route, path, params, query, auth, headers, iterations, warmup):
+    stats.reset()
+    # secure - щоб не отримати редірект SECURE_SSL_REDIRECT
+    for _ in range(warmup):
+        response = client.get(path, query, secure=True, headers=headers)
+    timings, queries, rows = [], [], []
+    for _ in range(iterations):
+        stats.reset()
+        started = time.perf_counter()
+        response = client.get(path, query, secure=True, headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(stats.queries)
+        rows.append(stats.rows)
+    if response.status_code in (401, 403, 405):
+        return None
+    return Result(
+        route=route.template, name=route.name, auth=auth, params=params,
+        status=response.status_code, timings=timings,
+        queries=statistics.median(queries), rows=statistics.median(rows),
+        size=len(response.content), statements=stats.statements,
+    )
+
+
+def as_dict(result):
+    return {
+        'route': result.route,
+        'name': result.name,
+        'auth': result.auth,
+        'params': result.params,
+        'status': result.status,
+        'p50_ms': round(percentile(result.timings, 50), 3),
+        'p95_ms': round(percentile(result.timings, 95), 3),
+        'p99_ms': round(percentile(result.timings, 99), 3),
+        'mean_ms': round(statistics.fmean(result.timings), 3),
+        'queries': result.queries,
+        'rows': result.rows,
+        'bytes': result.size,
+    }
+
+
+def result_key(entry):
+    """Ключ для порівняння результатів різних запусків"""
+    return entry['route'], entry['auth'], tuple(sorted(entry['params'].items()))
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
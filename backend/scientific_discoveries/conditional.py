@@ -0,0 +1,111 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Умовні GET (ETag) для list і retrieve ViewSet-а.
+
+    Валідатор будується одним легким запитом: для деталей - один рядок,
+    для списку - та сама сторінка, що й у відповіді, але тільки з полями
+    get_validator_fields(). Якщо клієнт надіслав If-None-Match і стан
+    не змінився - відповідаємо 304 без серіалізації.
+
+    Last-Modified не надсилається: лічильники (лайки, коментарі, підписники)
+    змінюються через update(F(...)) без updated_at, а сторінка списку залежить
+    і від рядків, що з неї зникли, - дата не описує представлення, ETag описує.
+
+    View має реалізувати get_validator_queryset() - queryset з тими ж
+    правилами видимості, але без select_related/prefetch_related.
+    """
+    validator_fields = ('pk', 'updated_at')
+
+    def get_validator_queryset(self):
+        raise NotImplementedError
+
+    def get_validator_fields(self):
+        return self.validator_fields
+
+    def get_validator_lookup(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def get_validator_rows(self, request):
+        fields = self.get_validator_fields()
+        queryset = self.get_validator_queryset()
+
+        if self.action == 'retrieve':
+            return list(queryset.filter(**self.get_validator_lookup()).values_list(*fields)[:1])
+
+        queryset = self.filter_queryset(queryset).values_list(*fields)
+        if self.paginator is None:
+            return list(queryset)
+        # Окремий екземпляр, щоб не зачепити стан пагінатора відповіді
+        return list(self.pagination_class().paginate_queryset(queryset, request, view=self))
+
+    async def aget_validator_rows(self, request):
+        """get_validator_rows для async view (див. async_views.py)"""
+        fields = self.get_validator_fields()
+        queryset = self.get_validator_queryset()
+
+        if self.action == 'retrieve':
+            return [row async for row in queryset.filter(**self.get_validator_lookup()).values_list(*fields)[:1]]
+
+        # Фільтри можуть читати БД (перевірка значень ModelChoiceFilter)
+        queryset = (await sync_to_async(self.filter_queryset)(queryset)).values_list(*fields)
+        if self.paginator is None:
+            return [row async for row in queryset]
+        return list(await self.pagination_class().apaginate_queryset(queryset, request, view=self))
+
+    def get_etag(self, request):
+        """ETag поточного представлення або None, якщо об'єкта немає"""
+        return self.make_etag(request, self.get_validator_rows(request))
+
+    async def aget_etag(self, request):
+        return self.make_etag(request, await self.aget_validator_rows(request))
+
+    def make_etag(self, request, rows):
+        self.validator_rows = rows
+        if self.action == 'retrieve' and not rows:
+            return None
+
+        user = request.user
+        state = repr((
+            request.accepted_renderer.format,
+            user.pk if user.is_authenticated else None,
+            request.get_full_path(),
+            rows,
+        ))
+        return quote_etag(hashlib.md5(state.encode('utf-8')).hexdigest())
+
+    def conditional_response(self, request, build):
+        """
+        Повертає 304, якщо представлення не змінилось, інакше - build().
+        У self.validator_rows лишаються рядки валідатора (для деталей - pk).
+        """
+        etag = self.get_etag(request)
+        response = self.not_modified_response(request, etag)
+        if response is None:
+            response = build()
+        return self.with_etag(response, etag)
+
+    async def aconditional_response(self, request, build):
+        """conditional_response для async view: build повертає корутину"""
+        etag = await self.aget_etag(request)
+        response = self.not_modified_response(request, etag)
+        if response is None:
+            response = await build()
+        return self.with_etag(response, etag)
+
+    def not_modified_response(self, request, etag):
+        if etag is None:
+            return None
+        return get_conditional_response(request, etag=etag)
+
+    def with_etag(self, response, etag):
+        if etag is not None and response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
@@ -0,0 +1,125 @@
+"""
+Читання з реплік БД (DATABASE_REPLICA_URLS).
+
+На репліки йдуть тільки безпечні (GET/HEAD/OPTIONS) запити view з ReplicaReadMixin;
+все інше - записи, фонові потоки, команди, автентифікація - працює з 'default'.
+
+Read-your-writes: після успішного змінюючого запиту користувач на
+REPLICA_PIN_SECONDS закріплюється за основною БД, тож свій лайк,
+коментар, підписку чи зміну профілю він бачить одразу, незважаючи
+на відставання реплік. Позначка зберігається в кеші Django, тому з репліками
+кеш має бути спільним для всіх воркерів (Redis, Memcached, БД) - інакше
+системна перевірка check_pin_cache не дає запуститись.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework import permissions
+
+PRIMARY = 'default'
+
+# Чи можна поточному запиту читати з реплік (ContextVar - окремо для кожного потоку / задачі)
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != PRIMARY]
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+
+
+def _pin_key(user_id):
+    return f'db:pinned:{user_id}'
+
+
+def pin_to_primary(user):
+    """Наступні REPLICA_PIN_SECONDS секунд користувач читає з основної БД"""
+    if pin_seconds() > 0:
+        cache.set(_pin_key(user.pk), True, timeout=pin_seconds())
+
+
+def is_pinned(user):
+    return cache.get(_pin_key(user.pk), False)
+
+
+@checks.register(checks.Tags.caches, checks.Tags.database)
+def check_pin_cache(app_configs, **kwargs):
+    """Read-your-writes з репліками потребує кешу, спільного для воркерів"""
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if replica_aliases() and isinstance(backend, (LocMemCache, DummyCache)):
+        return [checks.Error(
+            'DATABASE_REPLICA_URLS requires a cache shared between workers.',
+            hint=(
+                'Pins to the primary database after a write are stored in the default cache; with '
+                f'{type(backend).__name__} another worker would serve the user from a lagging replica. '
+                'Set CACHE_BACKEND to Redis, Memcached or DatabaseCache.'
+            ),
+            id='scientific_discoveries.E001',
+        )]
+    return []
+
+
+class ReplicaRouter:
+    """Роутер: читання - з випадкової репліки, якщо запит це дозволяє, записи і міграції - 'default'"""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            replicas = replica_aliases()
+            if replicas:
+                return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Репліки містять ті самі дані, що й основна БД
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплік приходить реплікацією з основної БД
+        return db == PRIMARY
+
+
+class ReplicaReadMixin:
+    """
+    Безпечні запити ViewSet-а читають з реплік (якщо вони налаштовані),
+    крім користувачів, закріплених за основною БД після власних змін
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    async def adispatch(self, request, *args, **kwargs):
+        # Async view (див. async_views.py): sync_to_async переносить змінну в потік і назад
+        token = _replica_reads.set(False)
+        try:
+            return await super().adispatch(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        # Автентифікація і перевірка прав - ще з основної БД
+        super().initial(request, *args, **kwargs)
+        if request.method in permissions.SAFE_METHODS and replica_aliases():
+            _replica_reads.set(not (request.user.is_authenticated and is_pinned(request.user)))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (
+            request.method not in permissions.SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,256 @@
+"""
+Метрики запитів API у форматі Prometheus (GET /api/metrics/).
+
+Для кожного view/дії (ContentViewSet.list, UserViewSet.follow, ...) MetricsMiddleware
+збирає затримку, кількість і час SQL-запитів, а також повтори однакових запитів
+у межах одного запиту - ознаку N+1. Однакові = той самий SQL без параметрів
+(списки IN (%s, %s, ...) будь-якої довжини вважаються однаковими).
+
+Метрики зберігаються в пам'яті процесу (як і view_counter), тобто
+кожен воркер gunicorn віддає свої. Вимкнено за замовчуванням: при METRICS_ENABLED = False
+middleware вилучається з ланцюжка при старті (MiddlewareNotUsed) і не коштує нічого.
+"""
+import hmac
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+# Межі кошиків гістограм (секунди і кількість запитів до БД)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+# Скільки найчастіших повторюваних запитів зберігати на кожен view
+TOP_STATEMENTS = 5
+MAX_STATEMENT_LENGTH = 200
+
+_IN_LIST = re.compile(r'\((?:%s, )+%s\)')
+_LIMIT = re.compile(r'\b(LIMIT|OFFSET) \d+')
+_SPACES = re.compile(r'\s+')
+
+
+def enabled():
+    return getattr(settings, 'METRICS_ENABLED', False)
+
+
+def n_plus_one_threshold():
+    return getattr(settings, 'METRICS_N_PLUS_ONE_THRESHOLD', 5)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """SQL без залежності від кількості параметрів IN (...) і розміру сторінки (LIMIT/OFFSET)"""
+    sql = _LIMIT.sub(r'\1 %s', _IN_LIST.sub('(%s, ...)', sql))
+    return _SPACES.sub(' ', sql).strip()
+
+
+def view_name(view_func, method):
+    """ContentViewSet.list / RegisterView.post / avatar_thumbnail"""
+    actions = getattr(view_func, 'actions', None)
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+    if actions is not None:
+        return f'{view_class.__name__}.{actions.get(method.lower(), method.lower())}'
+    return f'{view_class.__name__}.{method.lower()}'
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+
+class ViewMetrics:
+    """Агреговані метрики одного (view, метод)"""
+
+    def __init__(self):
+        self.statuses = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.query_seconds = 0.0
+        self.n_plus_one = 0
+        self.repeated = {}  # fingerprint -> кількість виконань у запитах з повторами
+
+
+class QueryRecorder:
+    """execute_wrapper: кількість, час і відбитки SQL-запитів одного HTTP-запиту"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] = self.statements.get(sql, 0) + 1
+
+    def repeated(self, threshold):
+        """Відбитки, виконані щонайменше threshold разів"""
+        counts = {}
+        for sql, count in self.statements.items():
+            key = fingerprint(sql)
+            counts[key] = counts.get(key, 0) + count
+        return {key: count for key, count in counts.items() if count >= threshold}
+
+
+class MetricsRegistry:
+    """Метрики всіх view процесу; module-level екземпляр - metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view, method, status, seconds, recorder):
+        repeated = recorder.repeated(n_plus_one_threshold())
+        with self._lock:
+            entry = self._views.get((view, method))
+            if entry is None:
+                entry = self._views[(view, method)] = ViewMetrics()
+            entry.statuses[status] = entry.statuses.get(status, 0) + 1
+            entry.latency.observe(seconds)
+            entry.queries.observe(recorder.count)
+            entry.query_seconds += recorder.seconds
+            if repeated:
+                entry.n_plus_one += 1
+                for key, count in repeated.items():
+                    entry.repeated[key] = entry.repeated.get(key, 0) + count
+                if len(entry.repeated) > TOP_STATEMENTS * 4:
+                    entry.repeated = dict(self._top(entry.repeated, TOP_STATEMENTS))
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    @staticmethod
+    def _top(repeated, limit):
+        return sorted(repeated.items(), key=lambda item: -item[1])[:limit]
+
+    def render(self):
+        """Текстовий формат експозиції Prometheus"""
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = []
+            write = lines.append
+
+            write('# HELP api_requests_total Requests by view, method and status code.')
+            write('# TYPE api_requests_total counter')
+            for (view, method), entry in views:
+                for status, count in sorted(entry.statuses.items()):
+                    write(f'api_requests_total{{{_labels(view, method)},status="{status}"}} {count}')
+
+            self._render_histogram(
+                write, views, 'api_request_duration_seconds', 'Request latency by view.', 'latency'
+            )
+            self._render_histogram(
+                write, views, 'api_db_queries_per_request', 'SQL statements per request by view.', 'queries'
+            )
+
+            write('# HELP api_db_query_duration_seconds_total Time spent in SQL statements by view.')
+            write('# TYPE api_db_query_duration_seconds_total counter')
+            for (view, method), entry in views:
+                write(f'api_db_query_duration_seconds_total{{{_labels(view, method)}}} {entry.query_seconds:.6f}')
+
+            write(
+                '# HELP api_n_plus_one_requests_total Requests that repeated the same SQL statement '
+                'at least METRICS_N_PLUS_ONE_THRESHOLD times.'
+            )
+            write('# TYPE api_n_plus_one_requests_total counter')
+            for (view, method), entry in views:
+                write(f'api_n_plus_one_requests_total{{{_labels(view, method)}}} {entry.n_plus_one}')
+
+            write('# HELP api_repeated_statement_executions_total Executions of repeated SQL statements (N+1 suspects).')
+            write('# TYPE api_repeated_statement_executions_total counter')
+            for (view, method), entry in views:
+                for statement, count in self._top(entry.repeated, TOP_STATEMENTS):
+                    write(
+                        f'api_repeated_statement_executions_total{{{_labels(view, method)},'
+                        f'statement="{_escape(statement[:MAX_STATEMENT_LENGTH])}"}} {count}'
+                    )
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(write, views, name, help_text, attribute):
+        write(f'# HELP {name} {help_text}')
+        write(f'# TYPE {name} histogram')
+        for (view, method), entry in views:
+            histogram = getattr(entry, attribute)
+            labels = _labels(view, method)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                write(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            write(f'{name}_bucket{{{labels},le="+Inf"}} {sum(histogram.counts)}')
+            write(f'{name}_sum{{{labels}}} {histogram.total:g}')
+            write(f'{name}_count{{{labels}}} {sum(histogram.counts)}')
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(view, method):
+    return f'view="{_escape(view)}",method="{method}"'
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Записує метрики кожного запиту до розпізнаного view (крім самого /api/metrics/)"""
+
+    def __init__(self, get_response):
+        if not enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        seconds = time.perf_counter() - started
+
+        view = getattr(request, 'metrics_view', None)
+        if view is not None:
+            metrics.record(view, request.method, response.status_code, seconds, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func is not metrics_view:
+            request.metrics_view = view_name(view_func, request.method)
+
+
+def metrics_view(request):
+    """
+    GET /api/metrics/ - метрики процесу для Prometheus.
+    Доступ: заголовок Authorization: Bearer <METRICS_TOKEN> або сесія адміністратора
+    """
+    if not enabled():
+        return HttpResponseNotFound()
+
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    authorized = bool(token) and hmac.compare_digest(header, f'Bearer {token}')
+    if not authorized and not request.user.is_staff:
+        return HttpResponseForbidden()
+
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
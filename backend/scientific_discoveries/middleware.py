@@ -0,0 +1,56 @@
+"""Middleware проєкту, що працює однаково під WSGI і ASGI"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise з асинхронним режимом. Оригінальний middleware лише синхронний,
+    тож під ASGI Django на кожному запиті перемикався б з event loop у потік
+    і назад заради пошуку статичного файлу. Тут пошук у словнику файлів іде
+    прямо в event loop, а в потік виносяться лише операції з файловою системою
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class AsyncUrlconfMiddleware:
+    """
+    Запити через ASGI маршрутизуються за asgi_urls.py - з асинхронними view
+    читання (див. async_views.py). Під WSGI URLconf не змінюється
+    """
+
+    sync_capable = True
+    async_capable = True
+    urlconf = 'scientific_discoveries.asgi_urls'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = self.urlconf
+        return self.get_response(request)
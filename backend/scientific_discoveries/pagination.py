@@ -0,0 +1,281 @@
+import base64
+import json
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.http import QueryDict
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PageNumberFallbackPagination(PageNumberPagination):
+    """Пагінація номерами сторінок (для клієнтів, яким потрібен count)"""
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) пагінація за поточним сортуванням queryset + id.
+
+    Замість COUNT(*) і OFFSET кожна сторінка - це діапазонний запит
+    "після останнього ключа", тому вартість не залежить від глибини.
+    Курсор кодує значення ключів першого/останнього елемента сторінки.
+
+    ?page=N - опціональний перехід на звичайну пагінацію номерами
+    сторінок (з count). Вона ж використовується, якщо сортування
+    не підходить для keyset (наприклад, за релевантністю пошуку).
+    """
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'Курсор сторінки (з полів next/previous)'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    page_query_param = 'page'
+    fallback_class = PageNumberFallbackPagination
+    # URL для посилань next/previous (за замовчуванням - URL запиту)
+    base_url = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if self.fallback is not None:
+            return self.fallback.paginate_queryset(queryset, request, view)
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset для async view: сторінка читається асинхронним ORM"""
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if self.fallback is not None:
+            # COUNT і OFFSET пагінації номерами - синхронний код DRF
+            return await sync_to_async(self.fallback.paginate_queryset)(queryset, request, view)
+        return self.set_page([obj async for obj in page_queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Запит сторінки (на один елемент більше - щоб знати, чи є наступна)
+        або None, якщо сторінка береться з пагінації номерами (self.fallback)
+        """
+        self.request = request
+        self.fallback = None
+
+        keys = self.get_keys(queryset, view)
+        if keys is None or self.page_query_param in self.get_query_params(request):
+            self.fallback = self.fallback_class()
+            return None
+
+        self.keys = keys
+        self.page_size = self.get_page_size(request)
+        self.cursor_values, self.reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = [
+            f'-{name}' if descending != self.reverse else name
+            for name, descending in keys
+        ]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor_values is not None:
+            queryset = queryset.filter(self.keyset_filter(self.cursor_values))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        """Поточна сторінка з результатів get_page_queryset()"""
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor_values is not None
+
+        self.page = results
+        return results
+
+    def get_query_params(self, request):
+        return request.query_params
+
+    def get_page_size(self, request):
+        try:
+            size = int(self.get_query_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_keys(self, queryset, view):
+        """
+        Ключі keyset: поля сортування queryset (тільки ті, що дозволені
+        в ordering_fields view) плюс первинний ключ як тай-брейкер.
+        """
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        allowed = set(getattr(view, 'ordering_fields', None) or ())
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str):
+                return None
+            name = item.lstrip('-')
+            if name in ('pk', 'id'):
+                break
+            if name not in allowed:
+                return None
+            keys.append((name, item.startswith('-')))
+        descending = keys[-1][1] if keys else False
+        keys.append(('pk', descending))
+        return keys
+
+    def keyset_filter(self, values):
+        """
+        (k1, k2, ...) після values у напрямку сортування.
+        Перший ключ винесено в окрему нестрогу умову, щоб БД могла
+        використати діапазонне сканування індексу.
+        """
+        def lookup(descending, strict):
+            after = 'lt' if descending != self.reverse else 'gt'
+            return after if strict else f'{after}e'
+
+        condition = Q()
+        for index, (name, descending) in enumerate(self.keys):
+            step = Q(**{f'{name}__{lookup(descending, True)}': values[index]})
+            for prev_index, (prev_name, _) in enumerate(self.keys[:index]):
+                step &= Q(**{prev_name: values[prev_index]})
+            condition |= step
+
+        first_name, first_descending = self.keys[0]
+        return Q(**{f'{first_name}__{lookup(first_descending, False)}': values[0]}) & condition
+
+    def decode_cursor(self, request, model):
+        encoded = self.get_query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            values = payload['v']
+            reverse = bool(payload.get('r'))
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError
+            # Курсор приходить від клієнта: значення приводяться до типів полів-ключів
+            values = [self.clean_key(model, name, value) for (name, _), value in zip(self.keys, values)]
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, ValidationError):
+            raise NotFound('Невірний курсор')
+        return values, reverse
+
+    def clean_key(self, model, name, value):
+        """Значення ключа з курсора як значення поля моделі (ValidationError / ValueError - невірний курсор)"""
+        if value is None:
+            raise ValueError
+        try:
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        value = field.to_python(value)
+        # Межі значень (наприклад, діапазон цілого стовпця в БД)
+        field.run_validators(value)
+        return value
+
+    def encode_cursor(self, obj, reverse):
+        values = []
+        for name, _ in self.keys:
+            value = getattr(obj, name)
+            # Повна точність дат (DjangoJSONEncoder обрізає мікросекунди)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'v': values, 'r': int(reverse)})
+        encoded = base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+        url = self.base_url or self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {
+                    'type': 'integer',
+                    'description': 'Тільки для пагінації номерами сторінок (?page=N)',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.cursor_query_description,
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Кількість елементів на сторінці',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.page_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Номер сторінки (вмикає пагінацію з count замість курсора)',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class EmbeddedFirstPagePagination(KeysetPagination):
+    """
+    Перша сторінка списку, вбудованого в іншу відповідь (профіль, деталі контенту).
+    cursor / page / page_size у запиті належать зовнішньому endpoint-у і ігноруються;
+    next веде на окремий endpoint списку (base_url)
+    """
+
+    def get_query_params(self, request):
+        return QueryDict()
+
+    def get_page_queryset(self, queryset, request, view=None):
+        if self.get_keys(queryset, view) is not None:
+            return super().get_page_queryset(queryset, request, view)
+
+        # Сортування не для keyset: зріз, а далі - друга сторінка номерами
+        self.request = request
+        self.fallback = None
+        self.keys = None
+        self.cursor_values, self.reverse = None, False
+        return queryset[:self.page_size + 1]
+
+    def get_next_link(self):
+        if self.keys is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.base_url or self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, 2)
+
+    def get_previous_link(self):
+        return None
@@ -32,8 +32,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'scientific_discoveries.middleware.AsyncUrlconfMiddleware',
+    'scientific_discoveries.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'scientific_discoveries.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,6 +64,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'scientific_discoveries.wsgi.application'
+ASGI_APPLICATION = 'scientific_discoveries.asgi.application'
+
+# ASGI: скільки HTTP-запитів процес обробляє одночасно (кожен - у своєму потоці
+# зі своїм з'єднанням з БД), решта чекає в черзі; 0 - без обмеження
+ASGI_MAX_CONCURRENCY = config('ASGI_MAX_CONCURRENCY', default=32, cast=int)
 
 # Database
 DATABASE_URL = config('DATABASE_URL', default=None)
@@ -77,6 +84,16 @@ else:
         }
     }
 
+# Репліки для читання (URL через кому): на них ідуть безпечні запити до контенту
+# і користувачів, див. scientific_discoveries/db_router.py. Після власного запису
+# користувач REPLICA_PIN_SECONDS секунд читає з основної БД
+DATABASE_REPLICA_URLS = config('DATABASE_REPLICA_URLS', default='', cast=Csv())
+for index, url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    # У тестовій БД репліка - та сама БД, що й default
+    DATABASES[f'replica{index}'] = {**dj_database_url.parse(url), 'TEST': {'MIRROR': 'default'}}
+DATABASE_ROUTERS = ['scientific_discoveries.db_router.ReplicaRouter'] if DATABASE_REPLICA_URLS else []
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -107,7 +124,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -131,6 +148,47 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Cache (за замовчуванням - пам'ять процесу; для кількох воркерів на одному
+# сервері можна вказати django.core.cache.backends.filebased.FileBasedCache)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='scientific-discoveries'),
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+}
+
+# Кеш відповідей для анонімних GET /api/contents/ (секунди)
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int)
+
+# Лічильник переглядів: як часто (секунди) буфер скидається в БД, 0 - писати одразу
+VIEW_COUNT_FLUSH_INTERVAL = config('VIEW_COUNT_FLUSH_INTERVAL', default=10, cast=int)
+
+# Стрічка: автори з більшою кількістю підписників не розсилаються в FeedEntry,
+# а домішуються при читанні; скільки контенту додається в стрічку після підписки
+FEED_FANOUT_MAX_FOLLOWERS = config('FEED_FANOUT_MAX_FOLLOWERS', default=1000, cast=int)
+FEED_BACKFILL_SIZE = config('FEED_BACKFILL_SIZE', default=50, cast=int)
+
+# Автокомпліт закладів: як часто (секунди) індекс перебудовується з актуальною кількістю користувачів
+INSTITUTION_INDEX_TTL = config('INSTITUTION_INDEX_TTL', default=300, cast=int)
+
+# Скільки секунд користувач JWT-запиту береться з кешу, 0 - читати з БД щоразу.
+# Інвалідація - видаленням ключа, тому з кількома процесами кеш має бути спільним (Redis / Memcached)
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=30, cast=int)
+
+# Мініатюри аватарів: розміри (px), каталог у MEDIA_ROOT, генерація у фоновому потоці
+AVATAR_THUMBNAIL_SIZES = (64, 128, 256)
+AVATAR_THUMBNAIL_DIR = 'avatars/thumbs'
+AVATAR_THUMBNAILS_ASYNC = config('AVATAR_THUMBNAILS_ASYNC', default=True, cast=bool)
+
+# Метрики запитів для Prometheus (/api/metrics/): доступ за токеном METRICS_TOKEN або для адмінів;
+# з якої кількості однакових SQL-запитів в одному запиті вважати його N+1
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_N_PLUS_ONE_THRESHOLD = config('METRICS_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
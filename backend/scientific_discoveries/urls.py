@@ -1,12 +1,14 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
-from users.views import InstitutionViewSet
+from scientific_discoveries.metrics import metrics_view
+from users.thumbnails import thumbnail_dir
+from users.views import InstitutionViewSet, avatar_thumbnail
 
 # Router для ViewSets
 router = DefaultRouter()
@@ -24,13 +26,20 @@ urlpatterns = [
     path('api/auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
 
+    # Метрики для Prometheus
+    path('api/metrics/', metrics_view, name='metrics'),
+
     # Apps
     path('api/', include(router.urls)),
     path('api/users/', include('users.urls')),
     path('api/contents/', include('contents.urls')),
 ]
 
-# Static and media files
+# Static and media files (у production media віддає веб-сервер / CDN, див. README)
 if settings.DEBUG:
+    # Мініатюри аватарів - з тими ж заголовками кешування, що й у production
+    urlpatterns.append(
+        re_path(rf'^{settings.MEDIA_URL.lstrip("/")}{thumbnail_dir()}/(?P<path>.+)$', avatar_thumbnail)
+    )
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
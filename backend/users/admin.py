@@ -16,12 +16,13 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('role', 'education_level', 'is_verified')
     search_fields = ('email', 'username', 'first_name', 'last_name')
     ordering = ('-created_at',)
+    readonly_fields = ('followers_count', 'following_count')
 
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Додаткова інформація', {
             'fields': ('role', 'institution', 'education_level', 'avatar',
                       'bio', 'scientific_interests', 'publications',
                       'orcid', 'google_scholar', 'web_of_science', 'scopus',
-                      'is_verified')
+                      'is_verified', 'followers_count', 'following_count')
         }),
     )
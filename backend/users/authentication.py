@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Поля профілю, які не потрібні для авторизації і прав доступу
+DEFERRED_FIELDS = (
+    'bio', 'scientific_interests', 'publications',
+    'orcid', 'google_scholar', 'web_of_science', 'scopus',
+)
+
+
+class UserCache:
+    """
+    Кеш користувачів для JWT-автентифікації (кеш Django AUTH_USER_CACHE_ALIAS).
+
+    Запис живе AUTH_USER_CACHE_TTL секунд і видаляється явно при збереженні
+    користувача (signals.py) та при змінах через update(). Кеш спільний для
+    всіх процесів (Redis / Memcached), тож зміна пароля чи деактивація діють
+    на наступному ж запиті в будь-якому воркері. Кожне читання з кешу дає
+    новий об'єкт, тому зміни request.user у кеш не потрапляють.
+    """
+    prefix = 'users:auth'
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'AUTH_USER_CACHE_ALIAS', 'default')]
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 30)
+
+    def make_key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+
+    def get(self, user_id):
+        if self.ttl <= 0:
+            return None
+        return self.cache.get(self.make_key(user_id))
+
+    def set(self, user_id, user):
+        if self.ttl <= 0:
+            return
+        self.cache.set(self.make_key(user_id), user, timeout=self.ttl)
+
+    def invalidate(self, user_id):
+        key = self.make_key(user_id)
+        self.cache.delete(key)
+        # Ще раз після коміту: інший процес міг встигнути закешувати рядок до коміту
+        transaction.on_commit(lambda: self.cache.delete(key))
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, що бере користувача з user_cache замість
+    запиту до БД на кожен авторизований запит
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.defer(*DEFERRED_FIELDS).get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            user_cache.set(user_id, user)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code='password_changed'
+                )
+
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Опис схеми автентифікації для drf-spectacular (та сама, що й у JWTAuthentication)"""
+    target_class = 'users.authentication.CachedJWTAuthentication'
@@ -0,0 +1,203 @@
+"""
+Автокомпліт закладів освіти без запитів до БД.
+
+Індекс усіх назв тримається в пам'яті процесу:
+- префікси слів -> id (пошук під час набору);
+- триграми -> слова словника назв (стійкість до одруківок).
+
+Назви і запити транслітеруються в латиницю, тому "київ", "kyiv" і "кіїв"
+потрапляють в одні й ті самі ключі. Результати ранжуються за кількістю
+користувачів закладу.
+
+Індекс - незмінний знімок: перебудова читає БД і будує новий знімок без
+блокувань, а потім одним присвоєнням підміняє старий, тож пошук не чекає
+на перебудову. Зміна закладу (signals.py) збільшує версію в кеші Django,
+спільному для процесів, і кожен процес перебудовує свій знімок при
+наступному запиті; лічильники користувачів оновлюються раз на INSTITUTION_INDEX_TTL секунд.
+"""
+import heapq
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+_TRANSLIT = str.maketrans({
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie',
+    'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l',
+    'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ь': '',
+    'ю': 'iu', 'я': 'ia', 'ы': 'y', 'э': 'e', 'ё': 'e', 'ъ': '',
+    "'": '', '’': '', 'ʼ': '', '`': '',
+})
+_WORD = re.compile(r'[a-z0-9]+')
+
+# Довші префікси не індексуються - перевіряються по самих словах
+MAX_PREFIX = 12
+# Мінімальна схожість слів (за триграмами), щоб вважати слово одруківкою
+FUZZY_THRESHOLD = 0.5
+# З якої кількості збігів брати перші результати з загального рейтингу замість сортування
+RANKED_SCAN_MIN = 200
+
+
+def normalize(text):
+    """Слова тексту в нижньому регістрі, транслітеровані в латиницю"""
+    return _WORD.findall((text or '').lower().translate(_TRANSLIT))
+
+
+def trigrams(word):
+    padded = f'^{word}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Snapshot:
+    """Незмінний після побудови стан індексу"""
+
+    def __init__(self, rows=()):
+        self.entries = {}       # id -> (назва, кількість користувачів)
+        self.words = {}         # id -> слова назви
+        self.prefixes = {}      # префікс слова -> id
+        self.word_ids = {}      # слово -> id
+        self.trigrams = {}      # триграма -> слова (словник, а не назви - він значно менший)
+        for pk, name, users_count in rows:
+            self._add(pk, name, users_count)
+        self.ranked = sorted(self.entries, key=self.rank_key)  # усі id за кількістю користувачів
+
+    def _add(self, pk, name, users_count):
+        words = normalize(name)
+        self.entries[pk] = (name, users_count)
+        self.words[pk] = words
+        for word in words:
+            for length in range(1, min(len(word), MAX_PREFIX) + 1):
+                self.prefixes.setdefault(word[:length], set()).add(pk)
+            if word not in self.word_ids:
+                for trigram in trigrams(word):
+                    self.trigrams.setdefault(trigram, set()).add(word)
+            self.word_ids.setdefault(word, set()).add(pk)
+
+    def rank_key(self, pk):
+        name, users_count = self.entries[pk]
+        return -users_count, name
+
+    def as_dicts(self, pks):
+        return [{'id': pk, 'name': self.entries[pk][0]} for pk in pks]
+
+
+class InstitutionIndex:
+    """Індекс назв закладів; module-level екземпляр - institution_index"""
+    version_key = 'users:institution-index:version'
+
+    def __init__(self):
+        # Лише одна перебудова одночасно; решта потоків тим часом читають попередній знімок
+        self._rebuild_lock = threading.Lock()
+        self._snapshot = None
+        self._version = None
+        self._built_at = None
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'INSTITUTION_INDEX_TTL', 300)
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # Початкова версія унікальна: якщо ключ витіснили з кешу, процеси все одно перебудуються
+            cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def invalidate(self):
+        """Заклади змінились - усі процеси перебудують індекс при наступному запиті"""
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), timeout=None)
+
+    def _get_snapshot(self):
+        version = self.version()
+        snapshot = self._snapshot
+        if snapshot is not None and version == self._version and time.monotonic() - self._built_at <= self.ttl:
+            return snapshot
+        # Перший знімок чекаємо, далі перебудовує один потік, а решта не блокується
+        if self._rebuild_lock.acquire(blocking=snapshot is None):
+            try:
+                if self._snapshot is snapshot:
+                    self.rebuild(version)
+            finally:
+                self._rebuild_lock.release()
+        return self._snapshot
+
+    def rebuild(self, version=None):
+        """Перечитує всі заклади з кількістю користувачів (один запит) і підміняє знімок"""
+        from .models import Institution
+
+        if version is None:
+            version = self.version()
+        rows = list(
+            Institution.objects.annotate(users_count=Count('users')).values_list('pk', 'name', 'users_count')
+        )
+        snapshot = Snapshot(rows)
+        self._snapshot, self._version, self._built_at = snapshot, version, time.monotonic()
+
+    def popular(self, limit=10):
+        """Заклади з найбільшою кількістю користувачів"""
+        snapshot = self._get_snapshot()
+        return snapshot.as_dicts(snapshot.ranked[:limit])
+
+    def search(self, query, limit=10):
+        """
+        Назви, де кожне слово запиту є префіксом якогось слова назви.
+        Слово без жодного збігу замінюється схожими за триграмами словами словника
+        """
+        words = normalize(query)
+        if not words:
+            return self.popular(limit)
+        snapshot = self._get_snapshot()
+
+        matches = None
+        for word in words:
+            found = self._prefix_matches(snapshot, word) or self._fuzzy_matches(snapshot, word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        if len(matches) > RANKED_SCAN_MIN:
+            # Збігів багато (короткий префікс) - перші limit з готового рейтингу
+            # знаходяться швидше, ніж сортування всіх збігів
+            top = []
+            for pk in snapshot.ranked:
+                if pk in matches:
+                    top.append(pk)
+                    if len(top) == limit:
+                        break
+            return snapshot.as_dicts(top)
+        return snapshot.as_dicts(heapq.nsmallest(limit, matches, key=snapshot.rank_key))
+
+    def _prefix_matches(self, snapshot, word):
+        candidates = snapshot.prefixes.get(word[:MAX_PREFIX], set())
+        if len(word) <= MAX_PREFIX:
+            return candidates
+        return {
+            pk for pk in candidates
+            if any(name_word.startswith(word) for name_word in snapshot.words[pk])
+        }
+
+    def _fuzzy_matches(self, snapshot, word):
+        """Заклади зі словами, схожими на word (коефіцієнт Дайса по триграмах)"""
+        word_trigrams = trigrams(word)
+        hits = Counter()
+        for trigram in word_trigrams:
+            hits.update(snapshot.trigrams.get(trigram, ()))
+
+        found = set()
+        for candidate, common in hits.items():
+            similarity = 2 * common / (len(word_trigrams) + len(trigrams(candidate)))
+            if similarity >= FUZZY_THRESHOLD:
+                found |= snapshot.word_ids[candidate]
+        return found
+
+
+institution_index = InstitutionIndex()
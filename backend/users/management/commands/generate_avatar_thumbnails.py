@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from users.models import User
+from users.thumbnails import is_stale, process
+
+
+class Command(BaseCommand):
+    help = 'Generate missing or outdated avatar thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regenerate thumbnails even if they look up to date'
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(avatar='').exclude(avatar__isnull=True).only('pk', 'avatar', 'avatar_thumbnails')
+        total = 0
+        for user in users.iterator(chunk_size=500):
+            if options['force']:
+                User.objects.filter(pk=user.pk).update(avatar_thumbnails={})
+            elif not is_stale(user):
+                continue
+            try:
+                process(user.pk)
+            except (OSError, ValueError) as exc:
+                self.stderr.write(f'Skipping user {user.pk}: {exc}')
+                continue
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Generated thumbnails for {total} users'))
@@ -0,0 +1,220 @@
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from users import search
+from users.autocomplete import institution_index
+from users.models import Institution, UserRole, EducationLevel
+
+User = get_user_model()
+
+FIELDS = (
+    'email', 'username', 'first_name', 'last_name', 'password',
+    'role', 'institution', 'education_level',
+)
+
+
+def read_rows(stream, file_format):
+    """Потоково читає рядки CSV (із заголовком) або JSONL"""
+    if file_format == 'csv':
+        for row in csv.DictReader(stream):
+            yield row
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _init_worker():
+    # При запуску воркерів через spawn налаштування Django ще не завантажені
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import users from a CSV (with header) or JSONL file. '
+        f'Recognized columns: {", ".join(FIELDS)}'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to a .csv or .jsonl file, or - for stdin')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='Input format (default: guessed from the file extension)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of users inserted per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes used for password hashing, the slowest step for rows '
+                 'with a password (default: number of CPUs)'
+        )
+        parser.add_argument(
+            '--default-role', choices=UserRole.values, default=UserRole.STUDENT,
+            help='Role for rows without one (default: student)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.json')) else 'csv')
+        self.default_role = options['default_role']
+        self.workers = max(options['workers'], 1)
+        self.institutions = {}
+        self.stats = {'created': 0, 'skipped': 0, 'institutions': 0}
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        started = time.monotonic()
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+                for chunk in chunked(read_rows(stream, file_format), options['chunk_size']):
+                    self.import_chunk(chunk, pool)
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f'{self.stats["created"]} created, {self.stats["skipped"]} skipped '
+                        f'({self.stats["created"] / elapsed:.0f} users/s)'
+                    )
+        except (csv.Error, json.JSONDecodeError) as exc:
+            raise CommandError(f'Malformed input: {exc}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {self.stats["created"]} users and {self.stats["institutions"]} institutions '
+            f'in {elapsed:.1f}s, skipped {self.stats["skipped"]} rows'
+        ))
+
+    def import_chunk(self, rows, pool):
+        rows = [row for row in map(self.clean_row, rows) if row is not None]
+
+        # Пропускаємо вже існуючих користувачів одним запитом на чанк.
+        # Email у базі може бути в будь-якому регістрі - порівнюємо lower(email) (індекс user_email_lower_idx)
+        existing = User.objects.annotate(email_lower=Lower('email')).filter(
+            Q(email_lower__in=[row['email'] for row in rows]) | Q(username__in=[row['username'] for row in rows])
+        ).values_list('email_lower', 'username')
+        taken = {value for pair in existing for value in pair}
+        fresh = []
+        for row in rows:
+            if row['email'] in taken or row['username'] in taken:
+                self.skip(row, 'already exists')
+                continue
+            taken.update((row['email'], row['username']))
+            fresh.append(row)
+        if not fresh:
+            return
+
+        institution_ids = self.resolve_institutions({row['institution'] for row in fresh if row['institution']})
+        # Хешування паролів - найдорожча частина імпорту, тому розносимо його по процесах.
+        # Рядки без пароля отримують непридатний пароль (вхід - після скидання пароля)
+        plain = [row['password'] for row in fresh if row['password']]
+        hashed = iter(pool.map(make_password, plain, chunksize=max(len(plain) // (self.workers * 4), 1)))
+        passwords = [next(hashed) if row['password'] else make_password(None) for row in fresh]
+
+        users = [
+            User(
+                email=row['email'],
+                username=row['username'],
+                first_name=row['first_name'],
+                last_name=row['last_name'],
+                role=row['role'],
+                education_level=row['education_level'],
+                institution_id=institution_ids.get(row['institution']),
+                password=password,
+            )
+            for row, password in zip(fresh, passwords)
+        ]
+        self.create_users(users, fresh)
+
+    def create_users(self, users, rows):
+        try:
+            self.insert(users, rows)
+        except IntegrityError:
+            # Хтось зареєструвався між перевіркою і вставкою - вставляємо чанк по одному,
+            # щоб пропустити лише конфліктні рядки
+            for user, row in zip(users, rows):
+                try:
+                    self.insert([user], [row])
+                except IntegrityError:
+                    self.skip(row, 'already exists')
+
+    def insert(self, users, rows):
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            # bulk_create не викликає сигналів - індексуємо пошук людей тут
+            search.index_users(
+                (user.pk, search.document_for(user, row['institution']))
+                for user, row in zip(users, rows)
+            )
+        self.stats['created'] += len(users)
+
+    def resolve_institutions(self, names):
+        """id закладів за назвами: один запит для ще невідомих назв, відсутні створюються пакетом"""
+        missing = names - self.institutions.keys()
+        if missing:
+            found = dict(Institution.objects.filter(name__in=missing).values_list('name', 'pk'))
+            new = missing - found.keys()
+            if new:
+                Institution.objects.bulk_create(
+                    [Institution(name=name) for name in new], ignore_conflicts=True
+                )
+                found.update(Institution.objects.filter(name__in=new).values_list('name', 'pk'))
+                self.stats['institutions'] += len(new)
+                # bulk_create не викликає сигналів - автокомпліт перебудується з новими назвами
+                institution_index.invalidate()
+            self.institutions.update(found)
+        return self.institutions
+
+    def clean_row(self, row):
+        row = {field: str(row.get(field) or '').strip() for field in FIELDS}
+        row['email'] = row['email'].lower()
+        try:
+            validate_email(row['email'])
+        except ValidationError:
+            return self.skip(row, 'invalid email')
+
+        if not row['username']:
+            # Частина email до @ не унікальна між доменами - додаємо короткий хеш адреси
+            digest = hashlib.md5(row['email'].encode('utf-8')).hexdigest()[:6]
+            row['username'] = f'{row["email"].split("@")[0]}-{digest}'
+        # Ті самі перевірки, що й при реєстрації: символи username і довжина полів
+        for field in ('username', 'first_name', 'last_name'):
+            try:
+                User._meta.get_field(field).run_validators(row[field])
+            except ValidationError:
+                return self.skip(row, f'invalid {field.replace("_", " ")}')
+        row['role'] = row['role'] or self.default_role
+        if row['role'] not in UserRole.values:
+            return self.skip(row, f'unknown role "{row["role"]}"')
+        row['education_level'] = row['education_level'] or EducationLevel.BACHELOR
+        if row['education_level'] not in EducationLevel.values:
+            return self.skip(row, f'unknown education level "{row["education_level"]}"')
+        return row
+
+    def skip(self, row, reason):
+        self.stats['skipped'] += 1
+        self.stderr.write(f'Skipping {row["email"] or "<no email>"}: {reason}')
+        return None
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 08:19
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    counts = queryset.order_by().values(group_by).annotate(total=Count('*')).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Follow = User.following.through
+
+    User.objects.update(
+        followers_count=_count(Follow.objects.filter(to_user=OuterRef('pk')), 'to_user'),
+        following_count=_count(Follow.objects.filter(from_user=OuterRef('pk')), 'from_user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Підписники'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Підписки'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
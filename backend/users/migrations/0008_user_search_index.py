@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-18 08:33
+
+import contents.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from users import search
+
+
+def create_search_index(apps, schema_editor):
+    """Створюємо індекс під поточну СУБД і індексуємо наявних користувачів"""
+    backend = search.get_backend(schema_editor.connection)
+    if backend is None:
+        return
+    User = apps.get_model('users', 'User')
+    users = User.objects.select_related('institution').order_by('pk')
+    with schema_editor.connection.cursor() as cursor:
+        backend.create_index(cursor)
+        for user in users.iterator(chunk_size=1000):
+            backend.index(cursor, user.pk, search.document_for(user))
+
+
+def drop_search_index(apps, schema_editor):
+    backend = search.get_backend(schema_editor.connection)
+    if backend is not None:
+        with schema_editor.connection.cursor() as cursor:
+            backend.drop_index(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_follow_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchEntry',
+            fields=[
+                ('user', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', contents.search.SearchDocumentField()),
+            ],
+            options={
+                'db_table': 'users_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 09:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+from users import search
+
+
+def reindex_users(apps, schema_editor):
+    """Email тепер у документі індексу - переіндексуємо наявних користувачів"""
+    backend = search.get_backend(schema_editor.connection)
+    if backend is None:
+        return
+    User = apps.get_model('users', 'User')
+    users = User.objects.select_related('institution').order_by('pk')
+    with schema_editor.connection.cursor() as cursor:
+        for user in users.iterator(chunk_size=1000):
+            backend.index(cursor, user.pk, search.document_for(user))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_user_avatar_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='user_email_lower_idx'),
+        ),
+        migrations.RunPython(reindex_users, migrations.RunPython.noop),
+    ]
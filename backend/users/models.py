@@ -1,5 +1,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
+
+from contents.search import SearchDocumentField
+
+from .search import SEARCH_TABLE
 
 
 class Institution(models.Model):
@@ -55,6 +60,8 @@ class User(AbstractUser):
     
     # Профіль
     avatar = models.ImageField('Фото', upload_to='avatars/', null=True, blank=True)
+    # Опис згенерованих мініатюр аватара (див. thumbnails.py)
+    avatar_thumbnails = models.JSONField('Мініатюри фото', default=dict, blank=True, editable=False)
     bio = models.TextField('Біографія', blank=True)
     scientific_interests = models.TextField('Наукові інтереси', blank=True)
     publications = models.TextField('Публікації', blank=True)
@@ -73,8 +80,13 @@ class User(AbstractUser):
         blank=True
     )
     
+    # Денормалізовані лічильники підписок (оновлюються в UserViewSet.follow)
+    followers_count = models.PositiveIntegerField('Підписники', default=0)
+    following_count = models.PositiveIntegerField('Підписки', default=0)
+
     is_verified = models.BooleanField('Верифікований', default=False)
     created_at = models.DateTimeField('Дата створення', auto_now_add=True)
+    updated_at = models.DateTimeField('Дата оновлення', auto_now=True)
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'role']
@@ -83,6 +95,29 @@ class User(AbstractUser):
         verbose_name = 'Користувач'
         verbose_name_plural = 'Користувачі'
         ordering = ['-created_at']
+        indexes = [
+            # Пошук за початком email без урахування регістру (див. search.py)
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
     
     def __str__(self):
         return self.email
+
+
+class UserSearchEntry(models.Model):
+    """
+    Запис індексу пошуку людей (див. search.py).
+    Таблиця створюється міграцією під конкретну СУБД, тому Django нею не керує.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_entry'
+    )
+    document = SearchDocumentField()
+
+    class Meta:
+        managed = False
+        db_table = SEARCH_TABLE
@@ -0,0 +1,65 @@
+"""
+Пошук людей.
+
+Індекс users_search влаштований так само, як contents_search (див. contents/search.py):
+ім'я, прізвище, username і email мають найбільшу вагу, далі - назва закладу,
+далі - наукові інтереси. Запит з "@" шукає за початком email без урахування регістру.
+"""
+from django.db import connection
+from django.db.models.functions import Lower
+
+from contents import search
+
+SEARCH_TABLE = 'users_search'
+
+# Поля користувача, які потрапляють в індекс
+INDEXED_FIELDS = ('first_name', 'last_name', 'username', 'email', 'scientific_interests', 'institution')
+
+
+def get_backend(conn=None):
+    return search.get_backend(conn, table=SEARCH_TABLE, references='users_user')
+
+
+def document_for(user, institution_name=None):
+    if institution_name is None:
+        institution_name = user.institution.name if user.institution else ''
+    return search.build_document(
+        f'{user.first_name} {user.last_name} {user.username} {user.email}',
+        institution_name,
+        user.scientific_interests,
+    )
+
+
+def index_users(documents, conn=None):
+    """Індексує пари (id користувача, документ)"""
+    backend = get_backend(conn)
+    if backend:
+        with (conn or connection).cursor() as cursor:
+            for user_id, document in documents:
+                backend.index(cursor, user_id, document)
+
+
+def index_user(user, conn=None):
+    index_users([(user.pk, document_for(user))], conn)
+
+
+def remove_user(user_id, conn=None):
+    backend = get_backend(conn)
+    if backend:
+        with (conn or connection).cursor() as cursor:
+            backend.remove(cursor, user_id)
+
+
+class UserSearchFilter(search.FullTextSearchFilter):
+    """Ранжований пошук людей по індексу users_search"""
+    search_description = "Пошук за ім'ям, username, email, закладом і науковими інтересами (з @ - за початком email)"
+    fallback_fields = ('first_name', 'last_name', 'username', 'email')
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip().lower()
+        if '@' in term:
+            # Префікс як діапазон по lower(email): його обслуговує індекс user_email_lower_idx
+            return queryset.alias(email_lower=Lower('email')).filter(
+                email_lower__gte=term, email_lower__lt=term + '\uffff'
+            )
+        return super().filter_queryset(request, queryset, view)
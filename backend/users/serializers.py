@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from .models import Institution
 
 User = get_user_model()
@@ -13,10 +14,35 @@ class InstitutionSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class AvatarThumbnailsMixin(serializers.Serializer):
+    """
+    Мініатюри аватара: avatar_thumbnail - найменший JPEG (для src),
+    avatar_srcset - WebP-варіанти для srcset. Поки мініатюр немає - null
+    """
+    avatar_thumbnail = serializers.SerializerMethodField()
+    avatar_srcset = serializers.SerializerMethodField()
+
+    def _thumbnail_url(self, name):
+        url = default_storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def _thumbnail_sizes(self, obj):
+        return sorted((obj.avatar_thumbnails or {}).get('sizes', {}).items(), key=lambda item: int(item[0]))
+
+    def get_avatar_thumbnail(self, obj) -> str | None:
+        sizes = self._thumbnail_sizes(obj)
+        return self._thumbnail_url(sizes[0][1]['jpeg']) if sizes else None
+
+    def get_avatar_srcset(self, obj) -> str | None:
+        sizes = self._thumbnail_sizes(obj)
+        if not sizes:
+            return None
+        return ', '.join(f'{self._thumbnail_url(variants["webp"])} {size}w' for size, variants in sizes)
+
+
+class UserSerializer(AvatarThumbnailsMixin, serializers.ModelSerializer):
     """Серіалізатор для перегляду користувачів"""
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
     full_name = serializers.SerializerMethodField()
     institution = serializers.SerializerMethodField()
 
@@ -24,18 +50,12 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = [
             'id', 'email', 'username', 'first_name', 'last_name', 'full_name',
-            'role', 'institution', 'education_level', 'avatar', 'bio',
+            'role', 'institution', 'education_level', 'avatar', 'avatar_thumbnail', 'avatar_srcset', 'bio',
             'scientific_interests', 'publications', 'orcid', 'google_scholar',
             'web_of_science', 'scopus',
             'is_verified', 'followers_count', 'following_count', 'created_at'
         ]
-        read_only_fields = ['id', 'is_verified', 'created_at']
-
-    def get_followers_count(self, obj) -> int:
-        return obj.followers.count()
-
-    def get_following_count(self, obj) -> int:
-        return obj.following.count()
+        read_only_fields = ['id', 'is_verified', 'followers_count', 'following_count', 'created_at']
 
     def get_full_name(self, obj) -> str:
         if obj.first_name or obj.last_name:
@@ -102,21 +122,32 @@ class UserUpdateSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         # Зберігаємо заклад освіти в базу якщо його ще немає
         institution_name = validated_data.pop('institution', None)
+        update_fields = [*validated_data, 'updated_at']
         if institution_name:
             institution, _ = Institution.objects.get_or_create(name=institution_name)
             instance.institution = institution
+            update_fields.append('institution')
         elif institution_name == '':
             instance.institution = None
-        return super().update(instance, validated_data)
+            update_fields.append('institution')
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Зберігаємо тільки змінені поля, щоб не перезаписати
+        # лічильники підписок застарілими значеннями
+        instance.save(update_fields=update_fields)
+        return instance
 
 
-class UserShortSerializer(serializers.ModelSerializer):
+class UserShortSerializer(AvatarThumbnailsMixin, serializers.ModelSerializer):
     """Короткий серіалізатор (для вкладення в інші об'єкти)"""
     full_name = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'first_name', 'last_name', 'full_name', 'avatar', 'role', 'is_verified']
+        fields = [
+            'id', 'username', 'first_name', 'last_name', 'full_name',
+            'avatar', 'avatar_thumbnail', 'avatar_srcset', 'role', 'is_verified'
+        ]
 
     def get_full_name(self, obj) -> str:
         if obj.first_name or obj.last_name:
@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from contents import feed
+
+from . import search
+from .authentication import user_cache
+from .autocomplete import institution_index
+from .models import Institution, User
+from .thumbnails import is_stale, thumbnail_queue
+
+
+@receiver(post_save, sender=Institution)
+@receiver(post_delete, sender=Institution)
+def invalidate_autocomplete(sender, instance, **kwargs):
+    """Після коміту: інакше інший процес може перебудувати індекс ще без цієї зміни"""
+    transaction.on_commit(institution_index.invalidate)
+
+
+@receiver(post_save, sender=Institution)
+def reindex_institution_users(sender, instance, created=False, **kwargs):
+    """Назва закладу є в документах його користувачів"""
+    if created:
+        return
+    users = instance.users.all()
+    search.index_users((user.pk, search.document_for(user, instance.name)) for user in users)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Профіль, пароль чи is_active змінились - наступний запит перечитає користувача"""
+    user_cache.invalidate(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def remember_follows(sender, instance, **kwargs):
+    """Підписки видаляються каскадом - запам'ятовуємо, чиї лічильники зміняться"""
+    follows = User.following.through.objects
+    instance._followed_ids = list(follows.filter(from_user=instance).values_list('to_user', flat=True))
+    instance._follower_ids = list(follows.filter(to_user=instance).values_list('from_user', flat=True))
+
+
+@receiver(post_delete, sender=User)
+def release_follow_counters(sender, instance, **kwargs):
+    """
+    Зменшуємо лічильники тих, на кого був підписаний і хто був підписаний на
+    видаленого користувача. Автори, що через це опустились до межі fan-out,
+    повертають свій контент у стрічки підписників (feed.followers_changed)
+    """
+    followed = getattr(instance, '_followed_ids', [])
+    followers = getattr(instance, '_follower_ids', [])
+    User.objects.filter(pk__in=followed).update(followers_count=F('followers_count') - 1)
+    User.objects.filter(pk__in=followers).update(following_count=F('following_count') - 1)
+
+    for author in User.objects.filter(pk__in=followed, followers_count=feed.fanout_limit()):
+        feed.followers_changed(author, author.followers_count + 1)
+    for user_id in (*followed, *followers):
+        user_cache.invalidate(user_id)
+
+
+@receiver(post_save, sender=User)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Переіндексуємо користувача, якщо змінились поля, що потрапляють в індекс"""
+    if update_fields is not None and not set(update_fields) & set(search.INDEXED_FIELDS):
+        return
+    search.index_user(instance)
+
+
+@receiver(post_delete, sender=User)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def schedule_avatar_thumbnails(sender, instance, update_fields=None, **kwargs):
+    """Нове чи видалене фото - перегенеровуємо мініатюри після коміту"""
+    if update_fields is not None and 'avatar' not in update_fields:
+        return
+    if is_stale(instance):
+        transaction.on_commit(lambda: thumbnail_queue.enqueue(instance.pk))
@@ -0,0 +1,182 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from scientific_discoveries.pagination import EmbeddedFirstPagePagination
+
+from .authentication import user_cache
+from .autocomplete import InstitutionIndex, institution_index
+from .management.commands import import_users
+from .models import Institution
+
+User = get_user_model()
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=0)
+class OverviewTests(TestCase):
+    """Вбудовані списки профілю - завжди перша сторінка, незалежно від параметрів запиту"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', email='author@example.com', password='x')
+        for index in range(3):
+            reader = User.objects.create_user(
+                username=f'reader{index}', email=f'reader{index}@example.com', password='x'
+            )
+            client = APIClient()
+            client.force_authenticate(reader)
+            client.post(f'/api/users/{self.user.pk}/follow/', secure=True)
+        self.url = f'/api/users/{self.user.pk}/overview/'
+
+    def test_query_params_do_not_page_embedded_lists(self):
+        client = APIClient()
+        followers = client.get(f'/api/users/{self.user.pk}/followers/?page_size=1', secure=True).data
+        expected = client.get(self.url, secure=True).data['followers']
+        self.assertEqual(len(expected['results']), 3)
+
+        for query in (f'?cursor={followers["next"].split("cursor=")[1]}', '?page=2', '?page_size=1'):
+            response = client.get(self.url + query, secure=True)
+            self.assertEqual(response.status_code, 200, query)
+            self.assertEqual(response.data['followers'], expected, query)
+
+    def test_next_links_to_dedicated_endpoint(self):
+        client = APIClient()
+        with mock.patch.object(EmbeddedFirstPagePagination, 'page_size', 2):
+            followers = client.get(self.url + '?page_size=1', secure=True).data['followers']
+        self.assertEqual(len(followers['results']), 2)
+        self.assertIn(f'/api/users/{self.user.pk}/followers/?cursor=', followers['next'])
+
+        rest = client.get(followers['next'], secure=True).data
+        self.assertEqual(len(rest['results']), 1)
+        self.assertNotIn(rest['results'][0]['id'], [item['id'] for item in followers['results']])
+
+    def test_async_views_match_sync_views(self):
+        reader = User.objects.get(username='reader0')
+        for headers in ({}, {'Authorization': f'Bearer {AccessToken.for_user(reader)}'}):
+            for url in (self.url, f'/api/users/{self.user.pk}/', '/api/users/?ordering=first_name'):
+                expected = APIClient().get(url, secure=True, headers=headers)
+                response = async_to_sync(AsyncClient().get)(url, secure=True, headers=headers)
+                self.assertEqual(response.status_code, 200, url)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'), url)
+                self.assertEqual(response.json(), expected.json(), url)
+            self.assertEqual(response.json()['results'][0]['username'], 'author')
+
+        is_following = async_to_sync(AsyncClient().get)(self.url, secure=True, headers=headers).json()['is_following']
+        self.assertTrue(is_following)
+
+
+@override_settings(AUTH_USER_CACHE_TTL=60)
+class CachedJWTAuthenticationTests(TestCase):
+    """Закешований користувач не переживає деактивацію чи зміну пароля"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', email='author@example.com', password='x')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def get_me(self):
+        return self.client.get('/api/users/me/', secure=True)
+
+    def test_deactivation_applies_to_cached_user(self):
+        self.assertEqual(self.get_me().status_code, 200)
+        self.assertIsNotNone(user_cache.get(self.user.pk))
+
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+
+        self.assertIsNone(user_cache.get(self.user.pk))
+        self.assertEqual(self.get_me().status_code, 401)
+
+    def test_request_does_not_change_cached_user(self):
+        self.assertEqual(self.get_me().status_code, 200)
+        cached = user_cache.get(self.user.pk)
+        cached.first_name = 'Змінено'
+        self.assertEqual(user_cache.get(self.user.pk).first_name, '')
+
+
+class UserSearchTests(TestCase):
+    """Пошук людей за email - без урахування регістру і без обов'язкового @"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='zoryana', email='Zoryana.Kvitka@Example.org', password='x', role='student'
+        )
+        User.objects.create_user(username='other', email='other@example.org', password='x', role='student')
+
+    def search(self, term):
+        response = APIClient().get('/api/users/', {'search': term}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data['results']]
+
+    def test_email_prefix_ignores_case(self):
+        self.assertEqual(self.search('zoryana.kvitka@ex'), [self.user.pk])
+        self.assertEqual(self.search('ZORYANA.KVITKA@'), [self.user.pk])
+
+    def test_email_without_at(self):
+        self.assertEqual(self.search('kvitka'), [self.user.pk])
+
+
+class ImportUsersTests(TestCase):
+    """import_users пропускає наявні (без урахування регістру email) і невалідні рядки"""
+
+    def import_rows(self, text):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'users.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        stderr = io.StringIO()
+        call_command('import_users', path, workers=1, stdout=io.StringIO(), stderr=stderr)
+        return stderr.getvalue()
+
+    def test_skips_existing_and_invalid_rows(self):
+        User.objects.create_user(username='taken', email='Mixed.Case@example.org', password='x', role='student')
+
+        errors = self.import_rows(
+            'email,username,role\n'
+            'mixed.case@example.org,mixed,student\n'
+            'bad@example.org,bad user!,student\n'
+            'fresh@example.org,fresh,student\n'
+        )
+
+        self.assertIn('mixed.case@example.org: already exists', errors)
+        self.assertIn('bad@example.org: invalid username', errors)
+        self.assertEqual(sorted(User.objects.values_list('username', flat=True)), ['fresh', 'taken'])
+
+    def test_integrity_error_skips_only_conflicting_rows(self):
+        # Конфлікт, якого не побачила попередня перевірка (паралельна реєстрація)
+        User.objects.create_user(username='fresh', email='other@example.org', password='x', role='student')
+        command = import_users.Command(stdout=io.StringIO(), stderr=io.StringIO())
+        command.stats = {'created': 0, 'skipped': 0, 'institutions': 0}
+        rows = [
+            {'email': 'fresh@example.org', 'institution': ''},
+            {'email': 'new@example.org', 'institution': ''},
+        ]
+
+        users = [User(username='fresh', email=rows[0]['email']), User(username='new', email=rows[1]['email'])]
+
+        command.create_users(users, rows)
+
+        self.assertEqual(command.stats, {'created': 1, 'skipped': 1, 'institutions': 0})
+        self.assertTrue(User.objects.filter(username='new').exists())
+
+
+class InstitutionIndexTests(TestCase):
+    """Зміни закладів видно в автокомпліті всіх процесів через версію в спільному кеші"""
+
+    def test_other_process_sees_new_institution(self):
+        other_process = InstitutionIndex()
+        Institution.objects.create(name='Київський університет')
+        self.assertEqual([item['name'] for item in other_process.search('київ')], ['Київський університет'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Institution.objects.create(name='Львівська політехніка')
+
+        self.assertEqual([item['name'] for item in other_process.search('lviv')], ['Львівська політехніка'])
+        self.assertEqual([item['name'] for item in institution_index.search('львів')], ['Львівська політехніка'])
@@ -0,0 +1,154 @@
+"""
+Мініатюри аватарів.
+
+Для кожного завантаженого аватара генеруються квадратні варіанти
+AVATAR_THUMBNAIL_SIZES у WebP і JPEG. Імена файлів містять хеш оригіналу,
+тому вміст за URL ніколи не змінюється і може кешуватись назавжди
+(Cache-Control: immutable - у веб-сервері / CDN, в DEBUG - views.avatar_thumbnail). Генерація йде у фоновому потоці процесу,
+щоб не затримувати запит з завантаженням фото.
+
+Опис варіантів зберігається в User.avatar_thumbnails:
+{"source": "<ім'я оригіналу>", "sizes": {"64": {"webp": "...", "jpeg": "..."}, ...}}
+"""
+import hashlib
+import logging
+import queue
+import threading
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+def thumbnail_sizes():
+    return tuple(getattr(settings, 'AVATAR_THUMBNAIL_SIZES', (64, 128, 256)))
+
+
+def thumbnail_dir():
+    return getattr(settings, 'AVATAR_THUMBNAIL_DIR', 'avatars/thumbs')
+
+
+def is_stale(user):
+    """Чи відповідають збережені мініатюри поточному аватару"""
+    return (user.avatar.name or '') != (user.avatar_thumbnails or {}).get('source', '')
+
+
+def render(image, size, options):
+    """Квадрат size x size з центру зображення"""
+    thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    if options['format'] == 'JPEG' and thumbnail.mode != 'RGB':
+        background = Image.new('RGB', thumbnail.size, 'white')
+        background.paste(thumbnail, mask=thumbnail.getchannel('A') if 'A' in thumbnail.getbands() else None)
+        thumbnail = background
+    output = BytesIO()
+    thumbnail.save(output, **options)
+    return output.getvalue()
+
+
+def generate(avatar):
+    """Створює (або знаходить уже створені) варіанти аватара, повертає опис sizes"""
+    with avatar.open('rb') as source:
+        data = source.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    sizes = {}
+    for size in thumbnail_sizes():
+        variants = {}
+        for extension, options in FORMATS.items():
+            name = f'{thumbnail_dir()}/{digest}-{size}.{extension}'
+            # Однаковий оригінал - однакові імена: повторно не генеруємо
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(render(image, size, options)))
+            variants[extension] = name
+        sizes[str(size)] = variants
+    return sizes
+
+
+def process(user_id):
+    """Оновлює мініатюри користувача, якщо аватар змінився з минулого разу"""
+    from contents.cache import response_cache
+    from .authentication import user_cache
+    from .models import User
+
+    user = User.objects.filter(pk=user_id).only('pk', 'avatar', 'avatar_thumbnails').first()
+    if user is None or not is_stale(user):
+        return
+
+    thumbnails = {}
+    if user.avatar:
+        thumbnails = {'source': user.avatar.name, 'sizes': generate(user.avatar)}
+
+    # Умова на avatar: якщо фото встигли замінити, результат застарів - його обробить наступна задача
+    updated = User.objects.filter(pk=user_id, avatar=user.avatar.name or '').update(
+        avatar_thumbnails=thumbnails, updated_at=timezone.now()
+    )
+    if updated:
+        user_cache.invalidate(user_id)
+        response_cache.bump()
+
+
+class ThumbnailQueue:
+    """
+    Локальна черга задач генерації мініатюр з одним фоновим потоком.
+    Якщо AVATAR_THUMBNAILS_ASYNC = False - задача виконується одразу.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def asynchronous(self):
+        return getattr(settings, 'AVATAR_THUMBNAILS_ASYNC', True)
+
+    def enqueue(self, user_id):
+        if not self.asynchronous:
+            process(user_id)
+            return
+        self._queue.put(user_id)
+        self._ensure_thread()
+
+    def join(self):
+        """Чекає, поки черга спорожніє"""
+        self._queue.join()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='avatar-thumbnails', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            user_id = self._queue.get()
+            try:
+                process(user_id)
+            except Exception:
+                logger.exception('Не вдалося створити мініатюри аватара користувача %s', user_id)
+            finally:
+                connections.close_all()
+                self._queue.task_done()
+
+
+thumbnail_queue = ThumbnailQueue()
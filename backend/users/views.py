@@ -1,9 +1,25 @@
 from rest_framework import viewsets, generics, status, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+from django.db import transaction
+from django.db.models import F
 
+from scientific_discoveries.async_views import AsyncReadMixin
+from scientific_discoveries.conditional import ConditionalGetMixin
+from scientific_discoveries.db_router import ReplicaReadMixin
+from scientific_discoveries.pagination import EmbeddedFirstPagePagination, KeysetPagination
+from contents import feed
+
+from .authentication import user_cache
+from .autocomplete import institution_index
 from .models import Institution
+from .search import UserSearchFilter
+from .thumbnails import thumbnail_dir
 from .serializers import (
     UserSerializer,
     UserCreateSerializer,
@@ -14,27 +30,37 @@ from .serializers import (
 
 User = get_user_model()
 
+# Скільки підказок повертає автокомпліт людей
+AUTOCOMPLETE_SIZE = 10
+
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, ConditionalGetMixin, AsyncReadMixin, viewsets.ModelViewSet):
     """
     ViewSet для роботи з користувачами
 
     GET /api/users/ - список всіх користувачів
+    GET /api/users/?search= - пошук людей (з ранжуванням)
+    GET /api/users/autocomplete/?search= - короткі картки для підказок
     GET /api/users/{id}/ - деталі користувача
     GET /api/users/me/ - профіль поточного користувача
     PATCH /api/users/{id}/ - оновити профіль
+    GET /api/users/{id}/overview/ - профіль разом з підписниками, підписками і контентом
     POST /api/users/{id}/follow/ - підписатися/відписатися
+
+    Під ASGI GET списку, деталей і overview - async view (див. async_views.py)
     """
-    queryset = User.objects.filter(is_staff=False)  # Приховуємо адмінів
+    queryset = User.objects.filter(is_staff=False).select_related('institution')  # Приховуємо адмінів
     serializer_class = UserSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['first_name', 'last_name', 'username', 'email']
+    pagination_class = KeysetPagination
+    # Пошук - останнім: без явного ordering сортує за релевантністю
+    filter_backends = [filters.OrderingFilter, UserSearchFilter]
     ordering_fields = ['created_at', 'first_name', 'last_name']
     ordering = ['-created_at']
+    async_actions = {'list': 'alist', 'retrieve': 'aretrieve', 'overview': 'aoverview'}
 
     def get_permissions(self):
         """Різні права доступу для різних дій"""
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'autocomplete', 'overview', 'contents', 'followers', 'following']:
             # Перегляд доступний всім
             return [permissions.AllowAny()]
         else:
@@ -47,13 +73,46 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserUpdateSerializer
         return UserSerializer
 
+    # Від чого залежить представлення користувача (для ETag)
+    validator_fields = ('pk', 'updated_at', 'followers_count', 'following_count')
+
+    def get_validator_queryset(self):
+        return User.objects.filter(is_staff=False)
+
+    def list(self, request, *args, **kwargs):
+        build_list = super().list
+        return self.conditional_response(request, lambda: build_list(request, *args, **kwargs))
+
+    async def alist(self, request, *args, **kwargs):
+        build_list = super().alist
+        return await self.aconditional_response(request, lambda: build_list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        build_detail = super().retrieve
+        return self.conditional_response(request, lambda: build_detail(request, *args, **kwargs))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        build_detail = super().aretrieve
+        return await self.aconditional_response(request, lambda: build_detail(request, *args, **kwargs))
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """GET /api/users/autocomplete/?search= - перші AUTOCOMPLETE_SIZE збігів"""
+        users = self.filter_queryset(User.objects.filter(is_staff=False))
+        if not request.query_params.get('search', '').strip():
+            users = users.none()
+        serializer = UserShortSerializer(users[:AUTOCOMPLETE_SIZE], many=True)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get', 'patch'])
     def me(self, request):
         """
         GET /api/users/me/ - отримати свій профіль
         PATCH /api/users/me/ - оновити свій профіль
         """
-        user = request.user
+        # request.user - з кешу автентифікації (без частини полів профілю),
+        # тому профіль читаємо з БД
+        user = User.objects.select_related('institution').get(pk=request.user.pk)
 
         if request.method == 'GET':
             serializer = UserSerializer(user)
@@ -79,41 +138,131 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if current_user.following.filter(pk=user_to_follow.pk).exists():
-            # Вже підписаний - відписуємось
-            current_user.following.remove(user_to_follow)
-            return Response({'status': 'unfollowed'})
-        else:
-            # Підписуємось
-            current_user.following.add(user_to_follow)
-            return Response({'status': 'followed'})
+        follows = User.following.through.objects
+        with transaction.atomic():
+            follow, created = follows.get_or_create(
+                from_user=current_user, to_user=user_to_follow
+            )
+            if created:
+                delta = 1
+            else:
+                # Вже підписаний - відписуємось.
+                # Рахуємо реально видалені рядки: паралельна відписка могла нас випередити
+                delta = -follows.filter(pk=follow.pk).delete()[0]
+            if delta:
+                User.objects.filter(pk=user_to_follow.pk).update(
+                    followers_count=F('followers_count') + delta
+                )
+                User.objects.filter(pk=current_user.pk).update(
+                    following_count=F('following_count') + delta
+                )
+                # Актуальна кількість (з паралельними підписками) - для меж fan-out стрічки
+                user_to_follow.refresh_from_db(fields=['followers_count'])
+                if delta > 0:
+                    feed.add_author(current_user, user_to_follow)
+                else:
+                    feed.remove_author(current_user, user_to_follow)
+                feed.followers_changed(user_to_follow, user_to_follow.followers_count - delta)
+
+        # Лічильники змінились через update() - скидаємо закешованих користувачів
+        user_cache.invalidate(current_user.pk)
+        user_cache.invalidate(user_to_follow.pk)
+
+        return Response({'status': 'followed' if created else 'unfollowed'})
 
     @action(detail=True, methods=['get'])
     def contents(self, request, pk=None):
-        """GET /api/users/{id}/contents/ - контент користувача"""
-        from contents.models import Content
+        """
+        GET /api/users/{id}/contents/ - публічний контент користувача
+        (з пагінацією та опціональною фільтрацією по content_type / status)
+        """
+        from contents.queries import author_contents
         from contents.serializers import ContentListSerializer
 
         user = self.get_object()
-        contents = Content.objects.filter(author=user, is_public=True)
-        serializer = ContentListSerializer(contents, many=True)
-        return Response(serializer.data)
+        contents = author_contents(user, request.query_params, public_only=True)
+        page = self.paginate_queryset(contents)
+        serializer = ContentListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def followers(self, request, pk=None):
-        """GET /api/users/{id}/followers/ - список підписників"""
+        """GET /api/users/{id}/followers/ - список підписників (з пагінацією)"""
         user = self.get_object()
-        followers = user.followers.all()
-        serializer = UserShortSerializer(followers, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(self.get_follow_queryset(user.followers))
+        serializer = UserShortSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def following(self, request, pk=None):
-        """GET /api/users/{id}/following/ - список підписок"""
+        """GET /api/users/{id}/following/ - список підписок (з пагінацією)"""
         user = self.get_object()
-        following = user.following.all()
-        serializer = UserShortSerializer(following, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(self.get_follow_queryset(user.following))
+        serializer = UserShortSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    def get_follow_queryset(self, manager):
+        return manager.order_by('-created_at', '-pk')
+
+    @action(detail=True, methods=['get'])
+    def overview(self, request, pk=None):
+        """
+        GET /api/users/{id}/overview/ - все для сторінки профілю одним запитом:
+        профіль з лічильниками, перші сторінки підписників, підписок і
+        публічного контенту, а також чи підписаний на нього поточний користувач.
+        Фіксована кількість запитів до БД незалежно від кількості підписок.
+        """
+        user = self.get_object()
+        is_following = request.user.is_authenticated and self.get_is_following_queryset(user).exists()
+
+        data = {
+            'user': UserSerializer(user, context=self.get_serializer_context()).data,
+            'is_following': is_following,
+        }
+        for name, (queryset, url_name, serializer_class) in self.get_overview_lists(user).items():
+            paginator = self.get_first_page_paginator(url_name, user)
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            data[name] = self.first_page_data(page, paginator, serializer_class)
+        return Response(data)
+
+    async def aoverview(self, request, pk=None):
+        """GET overview для async view"""
+        user = await self.aget_object()
+        is_following = request.user.is_authenticated and await self.get_is_following_queryset(user).aexists()
+
+        data = {
+            'user': UserSerializer(user, context=self.get_serializer_context()).data,
+            'is_following': is_following,
+        }
+        for name, (queryset, url_name, serializer_class) in self.get_overview_lists(user).items():
+            paginator = self.get_first_page_paginator(url_name, user)
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            data[name] = self.first_page_data(page, paginator, serializer_class)
+        return Response(data)
+
+    def get_is_following_queryset(self, user):
+        return User.following.through.objects.filter(from_user=self.request.user, to_user=user)
+
+    def get_overview_lists(self, user):
+        """Вбудовані в overview списки: ключ -> (queryset, маршрут для next, серіалізатор)"""
+        from contents.queries import author_contents
+        from contents.serializers import ContentListSerializer
+
+        return {
+            'followers': (self.get_follow_queryset(user.followers), 'user-followers', UserShortSerializer),
+            'following': (self.get_follow_queryset(user.following), 'user-following', UserShortSerializer),
+            'contents': (author_contents(user, {}, public_only=True), 'user-contents', ContentListSerializer),
+        }
+
+    def get_first_page_paginator(self, url_name, user):
+        """Пагінатор першої сторінки з посиланням next на відповідний окремий endpoint"""
+        paginator = EmbeddedFirstPagePagination()
+        paginator.base_url = self.request.build_absolute_uri(reverse(url_name, kwargs={'pk': user.pk}))
+        return paginator
+
+    def first_page_data(self, page, paginator, serializer_class):
+        serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+        return {'results': serializer.data, 'next': paginator.get_next_link()}
 
 
 class RegisterView(generics.CreateAPIView):
@@ -142,17 +291,28 @@ class InstitutionViewSet(viewsets.ModelViewSet):
     GET /api/institutions/ - список закладів (з пошуком)
     POST /api/institutions/ - додати новий заклад
     """
+    queryset = Institution.objects.all()
     serializer_class = InstitutionSerializer
     permission_classes = [permissions.AllowAny]
     http_method_names = ['get', 'post']
 
-    def get_queryset(self):
-        from django.db.models import Count
+    def list(self, request, *args, **kwargs):
+        """
+        Автокомпліт з індексу в пам'яті (див. autocomplete.py) - без запитів до БД.
+        Без пошукового запиту - найпопулярніші заклади
+        """
+        search = request.query_params.get('search', '')
+        institutions = institution_index.search(search) if search else institution_index.popular()
+        page = self.paginate_queryset(institutions)
+        return self.get_paginated_response(page)
+
 
-        search = self.request.query_params.get('search', '')
-        if search:
-            return Institution.objects.filter(name__icontains=search)[:10]
-        else:
-            return Institution.objects.annotate(
-                users_count=Count('users')
-            ).order_by('-users_count', 'name')[:10]
+def avatar_thumbnail(request, path):
+    """
+    GET /media/avatars/thumbs/<файл> - мініатюра аватара (тільки DEBUG; у production
+    MEDIA_URL віддає веб-сервер / CDN з тим самим Cache-Control, див. README).
+    Ім'я містить хеш оригіналу, тому вміст незмінний і кешується на рік
+    """
+    response = serve(request, f'{thumbnail_dir()}/{path}', document_root=settings.MEDIA_ROOT)
+    patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+    return response
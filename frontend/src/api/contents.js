@@ -19,8 +19,11 @@ export const contentsAPI = {
   // Лайкнути
   like: (slug) => api.post(`/contents/${slug}/like/`),
 
-  // Отримати коментарі
-  getComments: (slug) => api.get(`/contents/${slug}/comments/`),
+  // Отримати коментарі (params.parent - відповіді на коментар)
+  getComments: (slug, params = {}) => api.get(`/contents/${slug}/comments/`, { params }),
+
+  // Наступна сторінка списку (посилання next з відповіді)
+  getPage: (url) => api.get(url),
 
   // Додати коментар (з опціональним parent_id для відповідей)
   addComment: (slug, text, parentId = null) => {
@@ -34,6 +37,9 @@ export const contentsAPI = {
 
   // Мій контент
   getMy: (params = {}) => api.get('/contents/my/', { params }),
+
+  // Стрічка від тих, на кого я підписаний
+  getFeed: (params = {}) => api.get('/contents/feed/', { params }),
 };
 
 export const fieldsAPI = {
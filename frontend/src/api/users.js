@@ -7,6 +7,9 @@ export const usersAPI = {
   // Отримати користувача за id
   getById: (id) => api.get(`/users/${id}/`),
 
+  // Профіль разом з підписниками, підписками і контентом (один запит)
+  getOverview: (id) => api.get(`/users/${id}/overview/`),
+
   // Отримати контент користувача
   getContents: (id) => api.get(`/users/${id}/contents/`),
 
@@ -19,6 +22,9 @@ export const usersAPI = {
   // Отримати підписки
   getFollowing: (id) => api.get(`/users/${id}/following/`),
 
+  // Наступна сторінка списку за посиланням next з відповіді
+  getPage: (url) => api.get(url),
+
   // Оновити профіль поточного користувача
   updateProfile: (data) => api.patch('/users/me/', data),
 };
@@ -97,7 +97,11 @@ function ContentDetailPage() {
         ...content,
         comments: content.comments.map((c) =>
           c.id === parentId
-            ? { ...c, replies: [...(c.replies || []), response.data] }
+            ? {
+                ...c,
+                replies: [...(c.replies || []), response.data],
+                replies_count: (c.replies_count || 0) + 1,
+              }
             : c
         ),
       });
@@ -109,6 +113,41 @@ function ContentDetailPage() {
     setSubmitting(false);
   };
 
+  const handleMoreComments = async () => {
+    try {
+      const response = await contentsAPI.getPage(content.comments_next);
+      setContent({
+        ...content,
+        comments: [...content.comments, ...response.data.results],
+        comments_next: response.data.next,
+      });
+    } catch (err) {
+      console.error('Error loading comments:', err);
+    }
+  };
+
+  const handleMoreReplies = async (comment) => {
+    try {
+      // Перша сторінка відповідей замінює вбудовані, наступні - додаються
+      const response = comment.replies_next
+        ? await contentsAPI.getPage(comment.replies_next)
+        : await contentsAPI.getComments(slug, { parent: comment.id });
+      const replies = comment.replies_next
+        ? [...comment.replies, ...response.data.results]
+        : response.data.results;
+      setContent({
+        ...content,
+        comments: content.comments.map((c) =>
+          c.id === comment.id
+            ? { ...c, replies, replies_next: response.data.next }
+            : c
+        ),
+      });
+    } catch (err) {
+      console.error('Error loading replies:', err);
+    }
+  };
+
   const handleDelete = async () => {
     if (!window.confirm('Ви впевнені, що хочете видалити цей контент?')) return;
 
@@ -341,12 +380,30 @@ function ContentDetailPage() {
                               <p className="mb-0 mt-1">{reply.text}</p>
                             </div>
                           ))}
+                          {(c.replies_next || c.replies.length < c.replies_count) && (
+                            <Button
+                              variant="link"
+                              size="sm"
+                              className="p-0"
+                              onClick={() => handleMoreReplies(c)}
+                            >
+                              Показати ще відповіді
+                            </Button>
+                          )}
                         </div>
                       )}
                     </Card.Body>
                   </Card>
                 ))
               )}
+
+              {content.comments_next && (
+                <div className="text-center">
+                  <Button variant="outline-secondary" size="sm" onClick={handleMoreComments}>
+                    Показати ще коментарі
+                  </Button>
+                </div>
+              )}
             </Card.Body>
           </Card>
         </Col>
@@ -26,8 +26,11 @@ function ProfilePage() {
     scopus: '',
   });
   const [myContents, setMyContents] = useState([]);
+  const [myContentsNext, setMyContentsNext] = useState(null);
   const [followers, setFollowers] = useState([]);
+  const [followersNext, setFollowersNext] = useState(null);
   const [following, setFollowing] = useState([]);
+  const [followingNext, setFollowingNext] = useState(null);
   const [showFollowersModal, setShowFollowersModal] = useState(false);
   const [showFollowingModal, setShowFollowingModal] = useState(false);
   const [loading, setLoading] = useState(false);
@@ -92,6 +95,7 @@ function ProfilePage() {
       try {
         const response = await contentsAPI.getMy();
         setMyContents(response.data.results || response.data);
+        setMyContentsNext(response.data.next || null);
       } catch (err) {
         console.error('Error fetching contents:', err);
       }
@@ -99,6 +103,16 @@ function ProfilePage() {
     fetchMyContents();
   }, []);
 
+  const handleMoreContents = async () => {
+    try {
+      const response = await contentsAPI.getPage(myContentsNext);
+      setMyContents([...myContents, ...response.data.results]);
+      setMyContentsNext(response.data.next);
+    } catch (err) {
+      console.error('Error fetching contents:', err);
+    }
+  };
+
   useEffect(() => {
     const fetchFollowData = async () => {
       if (!user?.id) return;
@@ -108,7 +122,9 @@ function ProfilePage() {
           usersAPI.getFollowing(user.id),
         ]);
         setFollowers(followersRes.data.results || followersRes.data);
+        setFollowersNext(followersRes.data.next || null);
         setFollowing(followingRes.data.results || followingRes.data);
+        setFollowingNext(followingRes.data.next || null);
       } catch (err) {
         console.error('Error fetching follow data:', err);
       }
@@ -116,6 +132,26 @@ function ProfilePage() {
     fetchFollowData();
   }, [user?.id]);
 
+  const handleMoreFollowers = async () => {
+    try {
+      const response = await usersAPI.getPage(followersNext);
+      setFollowers([...followers, ...response.data.results]);
+      setFollowersNext(response.data.next);
+    } catch (err) {
+      console.error('Error fetching follow data:', err);
+    }
+  };
+
+  const handleMoreFollowing = async () => {
+    try {
+      const response = await usersAPI.getPage(followingNext);
+      setFollowing([...following, ...response.data.results]);
+      setFollowingNext(response.data.next);
+    } catch (err) {
+      console.error('Error fetching follow data:', err);
+    }
+  };
+
   const handleChange = (e) => {
     setFormData({ ...formData, [e.target.name]: e.target.value });
   };
@@ -182,7 +218,9 @@ function ProfilePage() {
             <Card.Body className="text-center">
               {user.avatar ? (
                 <Image
-                  src={user.avatar}
+                  src={user.avatar_thumbnail || user.avatar}
+                  srcSet={user.avatar_srcset || undefined}
+                  sizes="120px"
                   roundedCircle
                   width={120}
                   height={120}
@@ -212,7 +250,7 @@ function ProfilePage() {
                   className="mb-2"
                 >
                   <strong>Підписників:</strong>{' '}
-                  <span className="text-primary">{followers.length}</span>
+                  <span className="text-primary">{user.followers_count}</span>
                 </p>
                 <p
                   style={{ cursor: 'pointer' }}
@@ -220,7 +258,7 @@ function ProfilePage() {
                   className="mb-2"
                 >
                   <strong>Підписок:</strong>{' '}
-                  <span className="text-primary">{following.length}</span>
+                  <span className="text-primary">{user.following_count}</span>
                 </p>
                 {user.is_verified && (
                   <span className="badge bg-success">Верифікований</span>
@@ -439,7 +477,7 @@ function ProfilePage() {
               </Card>
             </Tab>
 
-            <Tab eventKey="contents" title={`Мій контент (${myContents.length})`}>
+            <Tab eventKey="contents" title={`Мій контент (${myContents.length}${myContentsNext ? '+' : ''})`}>
               <Card>
                 <Card.Body>
                   {myContents.length === 0 ? (
@@ -476,6 +514,13 @@ function ProfilePage() {
                       ))}
                     </div>
                   )}
+                  {myContentsNext && (
+                    <div className="text-center mt-3">
+                      <Button variant="outline-secondary" size="sm" onClick={handleMoreContents}>
+                        Показати ще
+                      </Button>
+                    </div>
+                  )}
                 </Card.Body>
               </Card>
             </Tab>
@@ -511,6 +556,13 @@ function ProfilePage() {
               ))}
             </ListGroup>
           )}
+          {followersNext && (
+            <div className="text-center mt-3">
+              <Button variant="outline-secondary" size="sm" onClick={handleMoreFollowers}>
+                Показати ще
+              </Button>
+            </div>
+          )}
         </Modal.Body>
       </Modal>
 
@@ -542,6 +594,13 @@ function ProfilePage() {
               ))}
             </ListGroup>
           )}
+          {followingNext && (
+            <div className="text-center mt-3">
+              <Button variant="outline-secondary" size="sm" onClick={handleMoreFollowing}>
+                Показати ще
+              </Button>
+            </div>
+          )}
         </Modal.Body>
       </Modal>
     </Container>
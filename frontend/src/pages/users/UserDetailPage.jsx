@@ -32,8 +32,11 @@ function UserDetailPage() {
 
   const [user, setUser] = useState(null);
   const [contents, setContents] = useState([]);
+  const [contentsNext, setContentsNext] = useState(null);
   const [followers, setFollowers] = useState([]);
+  const [followersNext, setFollowersNext] = useState(null);
   const [following, setFollowing] = useState([]);
+  const [followingNext, setFollowingNext] = useState(null);
   const [isFollowing, setIsFollowing] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
@@ -45,23 +48,16 @@ function UserDetailPage() {
   useEffect(() => {
     const fetchUser = async () => {
       try {
-        const [userResponse, contentsResponse, followersResponse, followingResponse] = await Promise.all([
-          usersAPI.getById(id),
-          usersAPI.getContents(id),
-          usersAPI.getFollowers(id),
-          usersAPI.getFollowing(id),
-        ]);
+        const { data } = await usersAPI.getOverview(id);
 
-        setUser(userResponse.data);
-        setContents(contentsResponse.data.results || contentsResponse.data);
-        setFollowers(followersResponse.data.results || followersResponse.data);
-        setFollowing(followingResponse.data.results || followingResponse.data);
-
-        // Перевіряємо чи поточний користувач підписаний
-        if (currentUser) {
-          const followerIds = (followersResponse.data.results || followersResponse.data).map(f => f.id);
-          setIsFollowing(followerIds.includes(currentUser.id));
-        }
+        setUser(data.user);
+        setContents(data.contents.results);
+        setContentsNext(data.contents.next);
+        setFollowers(data.followers.results);
+        setFollowersNext(data.followers.next);
+        setFollowing(data.following.results);
+        setFollowingNext(data.following.next);
+        setIsFollowing(data.is_following);
       } catch {
         setError('Користувача не знайдено');
       }
@@ -77,16 +73,30 @@ function UserDetailPage() {
       const response = await usersAPI.follow(id);
       if (response.data.status === 'followed') {
         setIsFollowing(true);
-        setFollowers([...followers, currentUser]);
+        setFollowers([currentUser, ...followers]);
+        setUser({ ...user, followers_count: user.followers_count + 1 });
       } else {
         setIsFollowing(false);
         setFollowers(followers.filter(f => f.id !== currentUser.id));
+        setUser({ ...user, followers_count: user.followers_count - 1 });
       }
     } catch (err) {
       console.error('Error following:', err);
     }
   };
 
+  // Наступна сторінка списку з окремого endpoint-а (overview містить лише першу)
+  const loadMore = async (next, items, setItems, setNext) => {
+    try {
+      const response = await usersAPI.getPage(next);
+      const loaded = new Set(items.map((item) => item.id));
+      setItems([...items, ...response.data.results.filter((item) => !loaded.has(item.id))]);
+      setNext(response.data.next);
+    } catch (err) {
+      console.error('Error loading more:', err);
+    }
+  };
+
   const getRoleBadge = (role) => {
     const variants = {
       student: 'info',
@@ -152,14 +162,14 @@ function UserDetailPage() {
                   style={{ cursor: 'pointer' }}
                   onClick={() => setShowFollowersModal(true)}
                 >
-                  <strong>{followers.length}</strong>
+                  <strong>{user.followers_count}</strong>
                   <div className="text-muted small">підписників</div>
                 </div>
                 <div
                   style={{ cursor: 'pointer' }}
                   onClick={() => setShowFollowingModal(true)}
                 >
-                  <strong>{following.length}</strong>
+                  <strong>{user.following_count}</strong>
                   <div className="text-muted small">підписок</div>
                 </div>
               </div>
@@ -285,6 +295,17 @@ function UserDetailPage() {
               </Card>
             ))
           )}
+          {contentsNext && (
+            <div className="text-center mt-3">
+              <Button
+                variant="outline-secondary"
+                size="sm"
+                onClick={() => loadMore(contentsNext, contents, setContents, setContentsNext)}
+              >
+                Показати ще
+              </Button>
+            </div>
+          )}
         </Col>
       </Row>
 
@@ -316,6 +337,17 @@ function UserDetailPage() {
               ))}
             </ListGroup>
           )}
+          {followersNext && (
+            <div className="text-center mt-3">
+              <Button
+                variant="outline-secondary"
+                size="sm"
+                onClick={() => loadMore(followersNext, followers, setFollowers, setFollowersNext)}
+              >
+                Показати ще
+              </Button>
+            </div>
+          )}
         </Modal.Body>
       </Modal>
 
@@ -347,6 +379,17 @@ function UserDetailPage() {
               ))}
             </ListGroup>
           )}
+          {followingNext && (
+            <div className="text-center mt-3">
+              <Button
+                variant="outline-secondary"
+                size="sm"
+                onClick={() => loadMore(followingNext, following, setFollowing, setFollowingNext)}
+              >
+                Показати ще
+              </Button>
+            </div>
+          )}
         </Modal.Body>
       </Modal>
     </Container>